@@ -1,9 +1,26 @@
 """Async flow executor for configurable nodes."""
+from __future__ import annotations
 
-from .config import FlowConfig, GlobalConfig
-from .execution import FlowExecutor, FlowResult
-from .global_state import get_global_state
-from .node import NodeInput, NodeOutput
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .config import FlowConfig, GlobalConfig
+    from .execution import FlowExecutor, FlowResult
+    from .global_state import get_global_state
+    from .node import NodeInput, NodeOutput
+
+# Public names are resolved on first access so thin entry points such as
+# ``conductor.container_entrypoint`` do not import the whole executor stack.
+_EXPORTS = {
+    "FlowConfig": ".config",
+    "GlobalConfig": ".config",
+    "FlowExecutor": ".execution",
+    "FlowResult": ".execution",
+    "get_global_state": ".global_state",
+    "NodeInput": ".node",
+    "NodeOutput": ".node",
+}
 
 __all__ = [
     "FlowConfig",
@@ -14,3 +31,16 @@ __all__ = [
     "NodeInput",
     "NodeOutput",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -4,15 +4,15 @@ from __future__ import annotations
 import argparse
 import asyncio
 import contextlib
-import json
 import logging
 import sys
 from pathlib import Path
 from typing import Any, Optional, Sequence
 
+from . import json_utils
 from .config import GlobalConfig, load_flow_config, load_global_config
 from .diagram import render_mermaid_diagram, summarise_trace
-from .execution import ExecutionTrace, FlowExecutor
+from .execution import ExecutionTrace, FlowExecutor, JSONLinesEventSink
 from .resources import ResourceResolver
 from .logging_utils import configure_logging
 
@@ -25,11 +25,10 @@ def _load_payload(
     if payload and payload_file:
         raise ValueError("Specify either --payload or --payload-file, not both.")
     if payload:
-        return json.loads(payload)
+        return json_utils.loads(payload)
     if payload_file:
         file_path = resolver.resolve_file(payload_file) if resolver else Path(payload_file)
-        text = Path(file_path).read_text()
-        return json.loads(text)
+        return json_utils.loads(Path(file_path).read_bytes())
     return None
 
 
@@ -38,7 +37,7 @@ def _load_trace(path: Optional[str], resolver: Optional[ResourceResolver]) -> Op
     if not path:
         return None
     file_path = resolver.resolve_file(path) if resolver else Path(path)
-    data = json.loads(Path(file_path).read_text())
+    data = json_utils.loads(Path(file_path).read_bytes())
     return ExecutionTrace.from_dict(data)
 
 
@@ -63,6 +62,22 @@ def _inject_code_paths(paths: Sequence[Path]) -> None:
                 pass
 
 
+# Traces can run to many megabytes; write them through a generous buffer.
+_TRACE_BUFFER_SIZE = 1 << 17
+
+
+def _print_json_bytes(value: Any, indent: bool) -> None:
+    """Print ``value`` as JSON without round-tripping through ``str``."""
+    stream = getattr(sys.stdout, "buffer", None)
+    if stream is None:  # pragma: no cover - stdout replaced by a text-only object
+        print(json_utils.dumps(value, indent=indent))
+        return
+    sys.stdout.flush()
+    stream.write(json_utils.dumps_bytes(value, indent=indent))
+    stream.write(b"\n")
+    stream.flush()
+
+
 async def _run_flow(args: argparse.Namespace) -> None:
     global_config = load_global_config(args.global_config) if args.global_config else GlobalConfig.from_mapping({})
 
@@ -77,20 +92,32 @@ async def _run_flow(args: argparse.Namespace) -> None:
 
             payload = _load_payload(args.payload, args.payload_file, resources)
 
-            async with FlowExecutor(flow_config, global_config, logger=logger) as executor:
-                results = await executor.run(initial_payload=payload)
-                if args.print_results:
-                    print(json.dumps([result.to_dict() for result in results], indent=2))
-                if args.print_state:
-                    print(json.dumps(executor.global_state.to_dict(), indent=2))
+            # Indentation is for people; pipes and files get compact JSON unless asked.
+            pretty = sys.stdout.isatty() if args.pretty is None else args.pretty
+
+            with contextlib.ExitStack() as stack:
+                event_sink = stack.enter_context(JSONLinesEventSink(args.event_log)) if args.event_log else None
+                async with FlowExecutor(
+                    flow_config,
+                    global_config,
+                    logger=logger,
+                    event_sink=event_sink,
+                    max_trace_events=args.max_trace_events,
+                ) as executor:
+                    results = await executor.run(initial_payload=payload)
+                    if args.print_results:
+                        print(json_utils.dumps([result.to_dict() for result in results], indent=pretty))
+                    if args.print_state:
+                        print(json_utils.dumps(executor.global_state.to_dict(), indent=pretty))
 
-                trace = executor.trace.to_dict() if executor.trace else None
-                if args.trace_file:
-                    if trace is None:
-                        raise RuntimeError("Trace data is not available for this run.")
-                    Path(args.trace_file).write_text(json.dumps(trace, indent=2))
-                if args.print_trace and trace:
-                    print(json.dumps(trace, indent=2))
+                    trace = executor.trace.to_dict() if executor.trace else None
+                    if args.trace_file:
+                        if trace is None:
+                            raise RuntimeError("Trace data is not available for this run.")
+                        with open(args.trace_file, "wb", buffering=_TRACE_BUFFER_SIZE) as handle:
+                            handle.write(json_utils.dumps_bytes(trace, indent=bool(args.pretty)))
+                    if args.print_trace and trace:
+                        _print_json_bytes(trace, pretty)
 
 
 
@@ -123,7 +150,7 @@ def _render_diagram(args: argparse.Namespace) -> None:
 
             if args.print_summary and trace:
                 summary = summarise_trace(trace)
-                print(json.dumps(summary, indent=2))
+                print(json_utils.dumps(summary, indent=True))
 
 
 
@@ -166,6 +193,28 @@ def build_parser() -> argparse.ArgumentParser:
         "--trace-file",
         help="Write the execution trace to the provided path as JSON.",
     )
+    run_parser.add_argument(
+        "--event-log",
+        help="Stream every trace event to the provided path as JSON lines while the flow runs.",
+    )
+    run_parser.add_argument(
+        "--max-trace-events",
+        type=int,
+        help="Keep only the most recent N events in memory (and in --trace-file/--print-trace output).",
+    )
+    run_parser.add_argument(
+        "--pretty",
+        dest="pretty",
+        action="store_true",
+        default=None,
+        help="Indent JSON output and trace files (default: only when stdout is a terminal).",
+    )
+    run_parser.add_argument(
+        "--no-pretty",
+        dest="pretty",
+        action="store_false",
+        help="Always emit compact JSON.",
+    )
     run_parser.set_defaults(func=_run_flow)
 
     diagram_parser = subparsers.add_parser("diagram", help="Render a diagram for the flow definition")
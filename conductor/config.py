@@ -4,22 +4,71 @@ from __future__ import annotations
 """Configuration models and helpers for conductor flows."""
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional
-import json
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, TypeVar
+import hashlib
+import os
+import pickle
+import sys
+
+from . import json_utils
+
+
+def _normalise_keys(
+    data: Mapping[str, Any], aliases: Mapping[str, Tuple[str, int, bool]]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split ``data`` into canonical values and unrecognised ``extra`` keys in one pass.
+
+    ``aliases`` maps every accepted spelling to ``(canonical_key, rank, last)``.
+    The result matches the historical ``data.get(a) or data.get(b)`` chains: the
+    lowest ranked truthy value wins, and when none is truthy the chain yields the
+    last spelling's value, which is ``None`` if that spelling is absent.
+    """
+
+    values: Dict[str, Any] = {}
+    ranks: Dict[str, int] = {}
+    fallbacks: Dict[str, Any] = {}
+    extra: Dict[str, Any] = {}
+    for key, value in data.items():
+        alias = aliases.get(key)
+        if alias is None:
+            extra[key] = value
+            continue
+        canonical, rank, last = alias
+        if value:
+            if rank < ranks.get(canonical, rank + 1):
+                values[canonical] = value
+                ranks[canonical] = rank
+        elif last:
+            fallbacks[canonical] = value
+        else:
+            fallbacks.setdefault(canonical, None)
+    for canonical, value in fallbacks.items():
+        values.setdefault(canonical, value)
+    return values, extra
+
 
-try:  # pragma: no cover - optional import
-    import tomllib  # type: ignore[attr-defined]
-except ModuleNotFoundError:  # pragma: no cover - Python <3.11
-    tomllib = None  # type: ignore[assignment]
+def _alias_table(*groups: Tuple[str, ...]) -> Dict[str, Tuple[str, int, bool]]:
+    # Spellings are listed in lookup order; the first one is the canonical key.
+    return {
+        alias: (group[0], rank, rank == len(group) - 1)
+        for group in groups
+        for rank, alias in enumerate(group)
+    }
 
-try:  # pragma: no cover - optional import
-    import yaml  # type: ignore
-except Exception:  # pragma: no cover - yaml is optional
-    yaml = None  # type: ignore[assignment]
 
+_REPOSITORY_ALIASES = _alias_table(
+    ("name",),
+    ("type", "kind"),
+    ("location", "path", "url", "target"),
+    ("reference", "ref", "branch"),
+    ("subpath", "sub_path", "folder"),
+    ("headers",),
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class RemoteLoggingConfig:
     """Settings describing the remote logging target."""
 
@@ -28,24 +77,37 @@ class RemoteLoggingConfig:
     headers: Dict[str, str] = field(default_factory=dict)
     enabled: bool = True
     verify: bool = True
+    batch_size: int = 1
+    flush_interval: float = 1.0
 
     @classmethod
     def from_mapping(cls, data: Mapping[str, Any] | None) -> "RemoteLoggingConfig | None":
+        # Falsy values such as ``false`` or ``{}`` disable remote logging.
         if not data:
             return None
-        if isinstance(data, Mapping):
-            target = data.get("target") or data.get("url")
-            if not target:
-                raise ValueError("Remote logging configuration requires a 'target' or 'url'.")
-            method = str(data.get("method", "POST")).upper()
-            headers = dict(data.get("headers", {}))
-            enabled = bool(data.get("enabled", True))
-            verify = bool(data.get("verify", True))
-            return cls(target=target, method=method, headers=headers, enabled=enabled, verify=verify)
-        raise TypeError("Remote logging configuration must be a mapping.")
-
-
-@dataclass
+        if not isinstance(data, Mapping):
+            raise TypeError("Remote logging configuration must be a mapping.")
+        target = data.get("target") or data.get("url")
+        if not target:
+            raise ValueError("Remote logging configuration requires a 'target' or 'url'.")
+        method = str(data.get("method", "POST")).upper()
+        headers = dict(data.get("headers") or ())
+        enabled = bool(data.get("enabled", True))
+        verify = bool(data.get("verify", True))
+        batch_size = max(1, int(data.get("batch_size") or data.get("batchSize") or 1))
+        flush_interval = float(data.get("flush_interval") or data.get("flushInterval") or 1.0)
+        return cls(
+            target=target,
+            method=method,
+            headers=headers,
+            enabled=enabled,
+            verify=verify,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+        )
+
+
+@dataclass(slots=True)
 class RepositoryLocation:
     """Description of a repository that stores resources or code."""
 
@@ -61,42 +123,21 @@ class RepositoryLocation:
     def from_mapping(cls, name: str, data: Mapping[str, Any]) -> "RepositoryLocation":
         if not isinstance(data, Mapping):
             raise TypeError(f"Repository location '{name}' must be a mapping.")
-        kind = str(data.get("type") or data.get("kind") or "filesystem").lower()
+        values, extra = _normalise_keys(data, _REPOSITORY_ALIASES)
+        kind = str(values.get("type") or "filesystem").lower()
         allowed = {"filesystem", "http", "git"}
         if kind not in allowed:
             raise ValueError(
                 f"Repository location '{name}' uses unsupported type '{kind}'."
             )
-        location = (
-            data.get("location")
-            or data.get("path")
-            or data.get("url")
-            or data.get("target")
-        )
+        location = values.get("location")
         if not location:
             raise ValueError(
                 f"Repository location '{name}' requires a 'location', 'path', 'url', or 'target'."
             )
-        reference = data.get("reference") or data.get("ref") or data.get("branch")
-        subpath = data.get("subpath") or data.get("sub_path") or data.get("folder")
-        headers = dict(data.get("headers", {}))
-        known_keys = {
-            "name",
-            "type",
-            "kind",
-            "location",
-            "path",
-            "url",
-            "target",
-            "reference",
-            "ref",
-            "branch",
-            "subpath",
-            "sub_path",
-            "folder",
-            "headers",
-        }
-        extra = {k: v for k, v in data.items() if k not in known_keys}
+        reference = values.get("reference")
+        subpath = values.get("subpath")
+        headers = dict(values.get("headers", {}))
         return cls(
             name=name,
             kind=kind,
@@ -139,7 +180,39 @@ def _parse_repository_locations(raw: Any, section_name: str) -> Dict[str, Reposi
     return locations
 
 
-@dataclass
+_GLOBAL_ALIASES = _alias_table(
+    ("remote_logging", "remoteLogging"),
+    ("env", "environment"),
+    ("container_registries", "containerRegistries"),
+    ("max_concurrency", "maxConcurrency"),
+    ("process_pool_size", "processPoolSize"),
+    ("thread_pool_size", "threadPoolSize"),
+    ("shared_state", "sharedState"),
+    ("dependencies", "python_dependencies"),
+    ("resource_locations", "resourceLocations"),
+    ("code_locations", "codeLocations"),
+)
+
+_NODE_ALIASES = _alias_table(
+    ("id",),
+    ("name",),
+    ("executor",),
+    ("callable", "function"),
+    ("image",),
+    ("command",),
+    ("args",),
+    ("env",),
+    ("transitions",),
+    ("timeout",),
+    ("with_global_state",),
+    ("withGlobalState",),
+    ("workdir",),
+    ("description",),
+    ("cache",),
+)
+
+
+@dataclass(slots=True)
 class GlobalConfig:
     """Runtime configuration shared across the entire flow."""
 
@@ -148,59 +221,34 @@ class GlobalConfig:
     container_registries: List[str] = field(default_factory=list)
     max_concurrency: Optional[int] = None
     process_pool_size: Optional[int] = None
+    thread_pool_size: Optional[int] = None
     shared_state: Dict[str, Any] = field(default_factory=dict)
     dependencies: List[str] = field(default_factory=list)
     resource_locations: Dict[str, RepositoryLocation] = field(default_factory=dict)
     code_locations: Dict[str, RepositoryLocation] = field(default_factory=dict)
     extra: Dict[str, Any] = field(default_factory=dict)
+    _registry_prefix: str = field(default="", init=False, repr=False, compare=False)
 
     @classmethod
     def from_mapping(cls, data: Mapping[str, Any] | None) -> "GlobalConfig":
         if not data:
             return cls()
 
-        remote_logging = None
-        if "remote_logging" in data or "remoteLogging" in data:
-            remote_logging = RemoteLoggingConfig.from_mapping(
-                data.get("remote_logging") or data.get("remoteLogging")
-            )
+        values, extra = _normalise_keys(data, _GLOBAL_ALIASES)
 
-        env = dict(data.get("env") or data.get("environment") or {})
-        registries = list(data.get("container_registries") or data.get("containerRegistries") or [])
-        max_concurrency = data.get("max_concurrency") or data.get("maxConcurrency")
-        process_pool_size = data.get("process_pool_size") or data.get("processPoolSize")
-        shared_state = dict(data.get("shared_state") or data.get("sharedState") or {})
-        dependencies = list(data.get("dependencies") or data.get("python_dependencies") or [])
-        resource_locations = _parse_repository_locations(
-            data.get("resource_locations") or data.get("resourceLocations"),
-            "resource_locations",
-        )
-        code_locations = _parse_repository_locations(
-            data.get("code_locations") or data.get("codeLocations"),
-            "code_locations",
-        )
-
-        known_keys = {
-            "remote_logging",
-            "remoteLogging",
-            "env",
-            "environment",
-            "container_registries",
-            "containerRegistries",
-            "max_concurrency",
-            "maxConcurrency",
-            "process_pool_size",
-            "processPoolSize",
-            "shared_state",
-            "sharedState",
-            "dependencies",
-            "python_dependencies",
-            "resource_locations",
-            "resourceLocations",
-            "code_locations",
-            "codeLocations",
-        }
-        extra = {k: v for k, v in data.items() if k not in known_keys}
+        remote_logging = None
+        if "remote_logging" in values:
+            remote_logging = RemoteLoggingConfig.from_mapping(values["remote_logging"])
+
+        env = dict(values.get("env") or {})
+        registries = list(values.get("container_registries") or [])
+        max_concurrency = values.get("max_concurrency")
+        process_pool_size = values.get("process_pool_size")
+        thread_pool_size = values.get("thread_pool_size")
+        shared_state = dict(values.get("shared_state") or {})
+        dependencies = list(values.get("dependencies") or [])
+        resource_locations = _parse_repository_locations(values.get("resource_locations"), "resource_locations")
+        code_locations = _parse_repository_locations(values.get("code_locations"), "code_locations")
 
         return cls(
             remote_logging=remote_logging,
@@ -208,6 +256,7 @@ class GlobalConfig:
             container_registries=registries,
             max_concurrency=int(max_concurrency) if max_concurrency is not None else None,
             process_pool_size=int(process_pool_size) if process_pool_size is not None else None,
+            thread_pool_size=int(thread_pool_size) if thread_pool_size is not None else None,
             shared_state=shared_state,
             dependencies=dependencies,
             resource_locations=resource_locations,
@@ -215,24 +264,51 @@ class GlobalConfig:
             extra=extra,
         )
 
+    def __post_init__(self) -> None:
+        # Use the first registry as default prefix
+        self._registry_prefix = (
+            self.container_registries[0].rstrip("/") + "/" if self.container_registries else ""
+        )
+
     def resolve_image(self, image: str) -> str:
         """Return the fully qualified container image using the configured registries."""
-        if "://" in image or "/" in image.split("/")[0]:
+        if not self._registry_prefix or "://" in image:
             return image
-        if not self.container_registries:
+        head, sep, _ = image.partition("/")
+        if sep and ("." in head or ":" in head or head == "localhost"):
+            # The first path component already names a registry host.
             return image
-        # Use the first registry as default prefix
-        prefix = self.container_registries[0].rstrip("/")
-        return f"{prefix}/{image}"
+        return self._registry_prefix + image
+
 
+_LIST_TYPES = (list, tuple)
+_STRBYTES = (str, bytes)
 
-@dataclass
+
+def _intern_target(target: Any) -> Any:
+    return sys.intern(target) if type(target) is str else target
+
+
+def _as_target_list(value: Any) -> List[Any]:
+    # Node ids, statuses and targets are interned so the per-hop lookups in
+    # FlowConfig.next_nodes and the executor compare keys by identity.
+    # Lists and tuples are by far the common case, so test them first.
+    if isinstance(value, _LIST_TYPES):
+        return [_intern_target(target) for target in value]
+    if isinstance(value, _STRBYTES):
+        return [_intern_target(value)]
+    if isinstance(value, Iterable):
+        return [_intern_target(target) for target in value]
+    return [value]
+
+
+@dataclass(slots=True)
 class NodeDefinition:
     """Description of a single node within a flow."""
 
     id: str
     name: Optional[str] = None
-    executor: str = "inline"  # inline | process | docker
+    executor: str = "inline"  # inline | thread | process | docker
     callable: Optional[str] = None
     image: Optional[str] = None
     command: List[str] = field(default_factory=list)
@@ -243,74 +319,61 @@ class NodeDefinition:
     with_global_state: bool = True
     workdir: Optional[str] = None
     description: Optional[str] = None
+    cache: bool = False
     extra: Dict[str, Any] = field(default_factory=dict)
 
     @classmethod
     def from_mapping(cls, data: Mapping[str, Any]) -> "NodeDefinition":
         if "id" not in data:
             raise ValueError("Each node definition requires an 'id'.")
-        transitions = data.get("transitions", {})
+        values, extra = _normalise_keys(data, _NODE_ALIASES)
+
+        transitions = values.get("transitions", {})
         if isinstance(transitions, list):
             # Allow shorthand list meaning default transitions
-            transitions = {"default": list(transitions)}
+            transitions = {"default": _as_target_list(transitions)}
         elif isinstance(transitions, Mapping):
-            transitions = {
-                str(key): list(value) if isinstance(value, Iterable) and not isinstance(value, (str, bytes)) else [value]
-                for key, value in transitions.items()
-            }
+            transitions = {sys.intern(str(key)): _as_target_list(value) for key, value in transitions.items()}
         else:
             raise TypeError("'transitions' must be a mapping or list if provided.")
 
-        extra_keys = {
-            "id",
-            "name",
-            "executor",
-            "callable",
-            "image",
-            "command",
-            "args",
-            "env",
-            "transitions",
-            "timeout",
-            "with_global_state",
-            "withGlobalState",
-            "workdir",
-            "description",
-        }
-
-        with_global_state = data.get("with_global_state")
-        if with_global_state is None and "withGlobalState" in data:
-            with_global_state = data["withGlobalState"]
+        executor = str(values.get("executor", "inline")).lower()
+        # An explicit ``with_global_state: false`` beats the camelCase spelling,
+        # so this key does not follow the truthy-first alias rule.
+        with_global_state = values.get("with_global_state")
+        if with_global_state is None and "withGlobalState" in values:
+            with_global_state = values["withGlobalState"]
         if with_global_state is None:
-            executor_type = str(data.get("executor", "inline")).lower()
-            with_global_state = executor_type != "docker"
+            with_global_state = executor != "docker"
 
-        command = data.get("command") or []
+        command = values.get("command") or []
         if isinstance(command, str):
             command = [command]
-        args = data.get("args") or []
+        args = values.get("args") or []
         if isinstance(args, str):
             args = [args]
+        timeout = values.get("timeout")
 
         return cls(
-            id=str(data["id"]),
-            name=data.get("name"),
-            executor=str(data.get("executor", "inline")).lower(),
-            callable=data.get("callable") or data.get("function"),
-            image=data.get("image"),
+            id=sys.intern(str(values["id"])),
+            name=values.get("name"),
+            executor=executor,
+            callable=values.get("callable"),
+            image=values.get("image"),
             command=list(command),
             args=list(args),
-            env=dict(data.get("env", {})),
+            env=dict(values.get("env", {})),
             transitions=transitions,
-            timeout=float(data["timeout"]) if "timeout" in data and data["timeout"] is not None else None,
+            timeout=float(timeout) if timeout is not None else None,
             with_global_state=bool(with_global_state),
-            workdir=data.get("workdir"),
-            description=data.get("description"),
-            extra={k: v for k, v in data.items() if k not in extra_keys},
+            workdir=values.get("workdir"),
+            description=values.get("description"),
+            cache=bool(values.get("cache", False)),
+            extra=extra,
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FlowConfig:
     """Complete configuration for a flow graph."""
 
@@ -319,6 +382,14 @@ class FlowConfig:
     nodes: Dict[str, NodeDefinition]
     description: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _successors: Dict[str, Tuple[Dict[str, Tuple[str, ...]], Tuple[str, ...]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _node_list: Tuple[NodeDefinition, ...] = field(default=(), init=False, repr=False, compare=False)
+    _id_to_idx: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _index_successors: List[Tuple[Dict[str, Tuple[int, ...]], Tuple[int, ...]]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def from_mapping(cls, data: Mapping[str, Any]) -> "FlowConfig":
@@ -333,19 +404,21 @@ class FlowConfig:
         else:
             raise TypeError("Flow configuration 'nodes' must be a mapping or a list.")
 
-        nodes: Dict[str, NodeDefinition] = {}
-        for node_mapping in nodes_iter:
-            node = NodeDefinition.from_mapping(node_mapping)
-            if node.id in nodes:
-                raise ValueError(f"Duplicate node identifier '{node.id}'.")
-            nodes[node.id] = node
+        definitions = [NodeDefinition.from_mapping(node_mapping) for node_mapping in nodes_iter]
+        nodes = {node.id: node for node in definitions}
+        if len(nodes) != len(definitions):
+            seen: set = set()
+            for node in definitions:
+                if node.id in seen:
+                    raise ValueError(f"Duplicate node identifier '{node.id}'.")
+                seen.add(node.id)
 
         start = data.get("start") or data.get("triggers")
         if start is None:
             raise ValueError("Flow configuration requires a 'start' list.")
-        if isinstance(start, (str, bytes)):
+        if isinstance(start, _STRBYTES):
             start = [start]
-        start_ids = [str(item) for item in start]
+        start_ids = [sys.intern(str(item)) for item in start]
 
         description = data.get("description")
         metadata = dict(data.get("metadata", {}))
@@ -357,14 +430,34 @@ class FlowConfig:
     def validate(self) -> None:
         if not self.start:
             raise ValueError("At least one start node must be defined.")
-        unknown_starts = [node_id for node_id in self.start if node_id not in self.nodes]
+        nodes = self.nodes
+        unknown_starts = [node_id for node_id in self.start if node_id not in nodes]
         if unknown_starts:
             raise ValueError(f"Unknown start node(s): {', '.join(unknown_starts)}")
-        for node in self.nodes.values():
-            for targets in node.transitions.values():
-                for target in targets:
-                    if target not in self.nodes:
-                        raise ValueError(f"Node '{node.id}' references unknown successor '{target}'.")
+        targets = {target for node in nodes.values() for group in node.transitions.values() for target in group}
+        if not targets <= nodes.keys():
+            # Only walk the graph again to name the first offender.
+            for node in nodes.values():
+                for group in node.transitions.values():
+                    for target in group:
+                        if target not in nodes:
+                            raise ValueError(f"Node '{node.id}' references unknown successor '{target}'.")
+        self._successors = {node_id: self._index_transitions(node) for node_id, node in self.nodes.items()}
+        self._node_list = tuple(self.nodes.values())
+        id_to_idx = {node_id: index for index, node_id in enumerate(self.nodes)}
+        self._id_to_idx = id_to_idx
+        self._index_successors = [
+            (
+                {status: tuple(id_to_idx[target] for target in group) for status, group in transitions.items()},
+                tuple(id_to_idx[target] for target in default),
+            )
+            for transitions, default in self._successors.values()
+        ]
+
+    @staticmethod
+    def _index_transitions(node: NodeDefinition) -> Tuple[Dict[str, Tuple[str, ...]], Tuple[str, ...]]:
+        transitions = {status: tuple(targets) for status, targets in (node.transitions or {}).items()}
+        return transitions, transitions.get("default", ())
 
     def get_node(self, node_id: str) -> NodeDefinition:
         try:
@@ -372,17 +465,37 @@ class FlowConfig:
         except KeyError as exc:  # pragma: no cover - validated earlier
             raise KeyError(f"Node '{node_id}' is not defined in the flow configuration.") from exc
 
-    def next_nodes(self, node_id: str, status: str) -> List[str]:
-        node = self.get_node(node_id)
-        transitions = node.transitions or {}
-        if status in transitions:
-            return list(transitions[status])
-        if "default" in transitions:
-            return list(transitions["default"])
-        return []
+    def next_nodes(self, node_id: str, status: str) -> Tuple[str, ...]:
+        """Return the successors of ``node_id`` for ``status``.
+
+        The tuple is shared with the flow's transition index rather than copied;
+        it is immutable, so callers can iterate it freely but must not expect a list.
+        """
+        lookup = self._successors.get(node_id)
+        if lookup is None:
+            lookup = self._successors[node_id] = self._index_transitions(self.get_node(node_id))
+        transitions, default = lookup
+        return transitions.get(status, default)
+
+    def index_of(self, node_id: str) -> int:
+        """Return the integer index of ``node_id`` used by :meth:`next_indices`."""
+        return self._id_to_idx[node_id]
+
+    def node_id_at(self, index: int) -> str:
+        return self._node_list[index].id
+
+    def next_indices(self, index: int, status: str) -> Tuple[int, ...]:
+        """Index-based counterpart of :meth:`next_nodes` for validated flows.
+
+        Indices follow the insertion order of :attr:`nodes` and are assigned by
+        :meth:`validate`, which ``from_mapping`` always calls.
+        """
+        transitions, default = self._index_successors[index]
+        return transitions.get(status, default)
 
     def __iter__(self):  # pragma: no cover - convenience helper
-        return iter(self.nodes.values())
+        # ``_node_list`` is filled in by validate(); fall back for unvalidated flows.
+        return iter(self._node_list or self.nodes.values())
 
 
 # ---------------------------------------------------------------------------
@@ -390,32 +503,112 @@ class FlowConfig:
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=1)
+def _get_yaml():
+    """Import PyYAML on first use so JSON-only invocations never load it."""
+    try:  # pragma: no cover - optional import
+        import yaml  # type: ignore
+    except Exception:  # pragma: no cover - yaml is optional
+        return None
+    return yaml
+
+
+@lru_cache(maxsize=1)
+def _get_tomllib():
+    """Import tomllib on first use; it is unavailable before Python 3.11."""
+    try:  # pragma: no cover - optional import
+        import tomllib  # type: ignore[attr-defined]
+    except ModuleNotFoundError:  # pragma: no cover - Python <3.11
+        return None
+    return tomllib
+
+
 def _load_mapping_from_path(path: Path) -> MutableMapping[str, Any]:
     suffix = path.suffix.lower()
-    text = path.read_text()
+    # JSON is parsed straight from bytes; only YAML and TOML need decoded text.
+    raw = path.read_bytes()
     if suffix in {".yaml", ".yml"}:
+        yaml = _get_yaml()
         if yaml is None:
             raise RuntimeError("PyYAML is required to load YAML configuration files.")
-        data = yaml.safe_load(text)
+        data = yaml.safe_load(raw.decode("utf-8"))
     elif suffix == ".toml":
+        tomllib = _get_tomllib()
         if tomllib is None:
             raise RuntimeError("tomllib is required to load TOML configuration files on this Python version.")
-        data = tomllib.loads(text)
+        data = tomllib.loads(raw.decode("utf-8"))
     else:
-        data = json.loads(text)
+        data = json_utils.loads(raw)
     if not isinstance(data, MutableMapping):
         raise TypeError("Configuration file must contain a mapping at the top level.")
     return data
 
 
+# Bump whenever the pickled layout of the configuration classes changes.
+_CONFIG_CACHE_FORMAT = 7
+
+_ConfigT = TypeVar("_ConfigT")
+
+
+def _config_cache_enabled() -> bool:
+    return os.environ.get("CONDUCTOR_CONFIG_CACHE", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _config_cache_file(kind: str, path: Path) -> Path:
+    stat = path.stat()
+    root = os.environ.get("CONDUCTOR_CONFIG_CACHE_DIR") or Path.home() / ".conductor" / "config-cache"
+    key = repr((_CONFIG_CACHE_FORMAT, kind, str(path.resolve()), stat.st_mtime_ns, stat.st_size))
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return Path(root).expanduser() / f"{digest}.pkl"
+
+
+def _load_with_cache(kind: str, path: Path, config_type: type, build: Callable[[Path], _ConfigT]) -> _ConfigT:
+    """Return ``build(path)``, reusing a pickled result while the file is unchanged.
+
+    Caching is opt-in through ``CONDUCTOR_CONFIG_CACHE=1``. Entries are keyed on
+    the resolved path, modification time and size, so editing a file always
+    triggers a fresh parse. Unreadable or stale cache entries are ignored.
+    """
+    if not _config_cache_enabled():
+        return build(path)
+    try:
+        cache_file = _config_cache_file(kind, path)
+    except OSError:
+        return build(path)
+    try:
+        with cache_file.open("rb") as handle:
+            cached = pickle.load(handle)
+    except Exception:
+        cached = None
+    if isinstance(cached, config_type):
+        return cached  # type: ignore[return-value]
+
+    config = build(path)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with temp_file.open("wb") as handle:
+            pickle.dump(config, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except OSError:  # pragma: no cover - cache is best effort
+        pass
+    return config
+
+
+def _build_flow_config(path: Path) -> FlowConfig:
+    return FlowConfig.from_mapping(_load_mapping_from_path(path))
+
+
+def _build_global_config(path: Path) -> GlobalConfig:
+    return GlobalConfig.from_mapping(_load_mapping_from_path(path))
+
+
 def load_flow_config(path: str | Path) -> FlowConfig:
     """Load a :class:`FlowConfig` instance from the provided path."""
-    mapping = _load_mapping_from_path(Path(path))
-    return FlowConfig.from_mapping(mapping)
+    return _load_with_cache("flow", Path(path), FlowConfig, _build_flow_config)
 
 
 def load_global_config(path: str | Path) -> GlobalConfig:
     """Load a :class:`GlobalConfig` instance from the provided path."""
-    mapping = _load_mapping_from_path(Path(path))
-    return GlobalConfig.from_mapping(mapping)
+    return _load_with_cache("global", Path(path), GlobalConfig, _build_global_config)
 
@@ -2,52 +2,81 @@
 from __future__ import annotations
 
 import atexit
-import json
+import hashlib
 import os
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-from .config import GlobalConfig, load_global_config
+from . import json_utils
 
-
-def _extract_cli_global_config(argv: List[str]) -> Tuple[Optional[int], Optional[Path]]:
-    for index, value in enumerate(argv):
-        if value == "--global-config" and index + 1 < len(argv):
-            return index, Path(argv[index + 1])
-        if value.startswith("--global-config="):
-            path_value = value.split("=", 1)[1]
-            return index, Path(path_value)
-    return None, None
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .config import GlobalConfig
 
 
 def _load_global_config_from_sources(
-    cli_path: Optional[Path], env_path: Optional[str], inline_json: Optional[str]
-) -> Tuple[Optional[Path], GlobalConfig, Optional[Path]]:
-    temp_file: Optional[Path] = None
-    if cli_path:
-        return cli_path, load_global_config(cli_path), temp_file
+    argv: List[str],
+) -> Tuple[bool, Optional[Path], GlobalConfig, Optional[Path]]:
+    """Resolve the global configuration from argv, then the environment.
+
+    Returns whether argv already names the file, the config path to forward to
+    the CLI, the parsed configuration and any temporary file that was written.
+    """
+
+    # Imported here so loading the entrypoint module stays as light as possible.
+    from .config import GlobalConfig, load_global_config
+
+    cli_value: Optional[str] = None
+    for index, value in enumerate(argv):
+        if value == "--global-config":
+            if index + 1 < len(argv):
+                cli_value = argv[index + 1]
+                break
+        elif value.startswith("--global-config="):
+            cli_value = value.split("=", 1)[1]
+            break
+    if cli_value is not None:
+        cli_path = Path(cli_value)
+        return True, cli_path, load_global_config(cli_path), None
+
+    env_path = os.environ.get("CONDUCTOR_GLOBAL_CONFIG")
     if env_path:
         config_path = Path(env_path).expanduser()
-        return config_path, load_global_config(config_path), temp_file
+        return False, config_path, load_global_config(config_path), None
+    inline_json = os.environ.get("CONDUCTOR_GLOBAL_CONFIG_JSON") or os.environ.get(
+        "CONDUCTOR_GLOBAL_CONFIG_INLINE"
+    )
     if inline_json:
-        data = json.loads(inline_json)
+        data = json_utils.loads(inline_json)
         config = GlobalConfig.from_mapping(data)
         handle = tempfile.NamedTemporaryFile("w", suffix=".json", prefix="conductor_config_", delete=False)
-        json.dump(data, handle)
+        handle.write(json_utils.dumps(data))
         handle.flush()
         handle.close()
         temp_file = Path(handle.name)
-        return temp_file, config, temp_file
-    return None, GlobalConfig.from_mapping({}), temp_file
+        return False, temp_file, config, temp_file
+    return False, None, GlobalConfig.from_mapping({}), None
+
+
+def _dependency_sentinel(packages: List[str], extra_args: Optional[str]) -> Path:
+    # The interpreter is part of the key so different virtualenvs never share a marker.
+    material = "\n".join([sys.executable, extra_args or "", *sorted(packages)])
+    key = hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+    root = os.environ.get("CONDUCTOR_DEPS_CACHE") or os.path.join(tempfile.gettempdir(), "conductor-deps")
+    return Path(root).expanduser() / f"{key}.ok"
 
 
 def _install_dependencies(packages: List[str]) -> None:
     if not packages:
         return
+    if os.environ.get("CONDUCTOR_SKIP_DEPS", "").strip().lower() in {"1", "true", "yes", "on"}:
+        return
     extra_args = os.environ.get("CONDUCTOR_PIP_EXTRA_ARGS")
+    sentinel = _dependency_sentinel(packages, extra_args)
+    if sentinel.exists():
+        return
     args: List[str] = [sys.executable, "-m", "pip", "install", "--no-cache-dir"]
     if extra_args:
         args.extend(extra_args.split())
@@ -57,25 +86,24 @@ def _install_dependencies(packages: List[str]) -> None:
         raise RuntimeError(
             f"Dependency installation failed with exit code {process.returncode}: {' '.join(packages)}"
         )
+    try:
+        sentinel.parent.mkdir(parents=True, exist_ok=True)
+        sentinel.touch()
+    except OSError:  # pragma: no cover - the marker is only an optimisation
+        pass
 
 
 def main(argv: Optional[List[str]] = None) -> None:
     args = list(sys.argv[1:] if argv is None else argv)
 
-    cli_index, cli_path = _extract_cli_global_config(args)
-    env_path = os.environ.get("CONDUCTOR_GLOBAL_CONFIG")
-    inline_json = os.environ.get("CONDUCTOR_GLOBAL_CONFIG_JSON") or os.environ.get(
-        "CONDUCTOR_GLOBAL_CONFIG_INLINE"
-    )
-
-    config_path, config, temp_file = _load_global_config_from_sources(cli_path, env_path, inline_json)
+    in_argv, config_path, config, temp_file = _load_global_config_from_sources(args)
     if temp_file:
         atexit.register(temp_file.unlink, missing_ok=True)
 
     if config.dependencies:
         _install_dependencies(config.dependencies)
 
-    if config_path is not None and cli_index is None:
+    if config_path is not None and not in_argv:
         args.extend(["--global-config", str(config_path)])
 
     from .cli import main as cli_main
@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 import json
-import textwrap
-from collections import Counter, defaultdict
-from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .config import FlowConfig, NodeDefinition
-from .execution import ExecutionTrace
+from .execution import ExecutionEvent, ExecutionTrace
 
 _MAX_LABEL_LENGTH = 10000
 _WRAP_WIDTH = 60
@@ -15,9 +15,79 @@ _NODE_BASE_WIDTH = 260
 _NODE_METADATA_WIDTH = 420
 _CHAR_PIXEL_WIDTH = 9
 _NODE_HORIZONTAL_PADDING = 60
+_DURATION = attrgetter("duration")
+_SCALAR_TYPES = (int, float, bool)
 
+# Maps (id(value), max_length, wrap_width) to the value and its rendering.
+_FormatCache = Dict[Tuple[int, int, int], Tuple[Any, str]]
 
-def _format_value(value: Any, *, max_length: int = _MAX_LABEL_LENGTH, wrap_width: int = _WRAP_WIDTH) -> str:
+
+def _wrap_line(line: str, width: int, out: List[str]) -> None:
+    """Append ``line`` to ``out`` wrapped at spaces to at most ``width`` characters.
+
+    Matches ``textwrap.wrap(line, width, break_long_words=False,
+    break_on_hyphens=False)``: tabs are expanded first, words longer than
+    ``width`` are kept whole on a line of their own, and spaces around breaks
+    and at the end are dropped. The one difference is that leading indentation
+    is never used as a break point: when the indentation plus the first word
+    exceed ``width``, textwrap drops the indentation and may fill the rest of
+    that line with the following words, whereas here the indented word stays
+    alone on its line and wrapping continues after it.
+    """
+    if "\t" in line:
+        line = line.expandtabs()
+    length = len(line)
+    start = 0
+    floor = length - len(line.lstrip(" "))
+    while length - start > width:
+        cut = line.rfind(" ", max(start, floor), start + width + 1)
+        if cut <= start:
+            cut = line.find(" ", start + width + 1)
+            if cut == -1:
+                break
+        piece = line[start:cut].rstrip(" ")
+        if piece:
+            out.append(piece)
+        start = cut + 1
+        while start < length and line[start] == " ":
+            start += 1
+        floor = start
+    if start < length:
+        piece = line[start:].rstrip(" ")
+        if piece:
+            out.append(piece)
+
+
+def _format_value(
+    value: Any,
+    *,
+    max_length: int = _MAX_LABEL_LENGTH,
+    wrap_width: int = _WRAP_WIDTH,
+    cache: Optional[_FormatCache] = None,
+) -> str:
+    # Short scalars come out of the general path unchanged, so skip it.
+    value_type = type(value)
+    if value_type is str:
+        if (
+            len(value) <= wrap_width
+            and (not max_length or len(value) <= max_length)
+            and '"' not in value
+            and value.isprintable()
+        ):
+            return value
+    elif value_type in _SCALAR_TYPES:
+        text = str(value)
+        if len(text) <= wrap_width and (not max_length or len(text) <= max_length):
+            return text
+    if cache is not None:
+        key = (id(value), max_length, wrap_width)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit[1]
+        formatted = _format_value(value, max_length=max_length, wrap_width=wrap_width)
+        # Holding ``value`` keeps its id from being reused while the cache lives.
+        cache[key] = (value, formatted)
+        return formatted
     if value is None:
         text = "None"
     elif isinstance(value, (dict, list)):
@@ -31,22 +101,15 @@ def _format_value(value: Any, *, max_length: int = _MAX_LABEL_LENGTH, wrap_width
         if len(line) <= wrap_width:
             wrapped_lines.append(line)
         else:
-            wrapped_lines.extend(
-                textwrap.wrap(
-                    line,
-                    wrap_width,
-                    break_long_words=False,
-                    break_on_hyphens=False,
-                )
-            )
+            _wrap_line(line, wrap_width, wrapped_lines)
     formatted = "\n".join(wrapped_lines)
     if max_length and len(formatted) > max_length:
         formatted = formatted[: max_length - 3] + "..."
     return formatted
 
 
-def _format_block(prefix: str, value: Any) -> str:
-    formatted = _format_value(value)
+def _format_block(prefix: str, value: Any, cache: Optional[_FormatCache] = None) -> str:
+    formatted = _format_value(value, cache=cache)
     if "\n" not in formatted:
         return f"{prefix}: {formatted}"
     first_line, *rest = formatted.splitlines()
@@ -56,59 +119,37 @@ def _format_block(prefix: str, value: Any) -> str:
 
 
 def _format_label(chunks: List[str]) -> Tuple[str, int]:
-    html_lines: List[str] = []
+    rendered: List[str] = []
     max_length = 0
+    # A run of blank lines collapses into one break, and breaks are only
+    # emitted between content lines, so nothing needs trimming afterwards.
+    pending_break = False
     for chunk in chunks:
         for raw_line in chunk.splitlines():
             stripped = raw_line.lstrip()
-            leading = len(raw_line) - len(stripped)
-            if stripped:
-                indent = "&nbsp;" * leading
-                html_lines.append(f"{indent}{stripped}")
-                max_length = max(max_length, leading + len(stripped))
-            else:
-                html_lines.append("")
-    rendered: List[str] = []
-    for line in html_lines:
-        if line == "":
-            if not rendered or rendered[-1] != "<br/>":
+            if not stripped:
+                pending_break = True
+                continue
+            if pending_break and rendered:
                 rendered.append("<br/>")
-        else:
-            rendered.append(line)
-    while rendered and rendered[0] == "<br/>":
-        rendered.pop(0)
-    while rendered and rendered[-1] == "<br/>":
-        rendered.pop()
+            pending_break = False
+            leading = len(raw_line) - len(stripped)
+            rendered.append("&nbsp;" * leading + stripped if leading else stripped)
+            if leading + len(stripped) > max_length:
+                max_length = leading + len(stripped)
     return "<br/>".join(rendered), max_length
 
 
 def summarise_trace(trace: ExecutionTrace) -> Dict[str, Any]:
-    node_data: Dict[str, Dict[str, Any]] = {}
+    events_by_node: Dict[str, List[ExecutionEvent]] = {}
     edge_counts: Counter[Tuple[str, str, str]] = Counter()
     order: List[Dict[str, Any]] = []
 
     for event in trace.events:
-        stats = node_data.setdefault(
-            event.node_id,
-            {
-                "count": 0,
-                "total_duration": 0.0,
-                "last_duration": 0.0,
-                "last_status": None,
-                "last_input": None,
-                "last_output": None,
-                "last_metadata": None,
-                "statuses": defaultdict(int),
-            },
-        )
-        stats["count"] += 1
-        stats["total_duration"] += event.duration
-        stats["last_duration"] = event.duration
-        stats["last_status"] = event.status
-        stats["last_input"] = (event.node_input or {}).get("data") if event.node_input else None
-        stats["last_output"] = (event.node_output or {}).get("data")
-        stats["last_metadata"] = (event.node_output or {}).get("metadata")
-        stats["statuses"][event.status] += 1
+        node_events = events_by_node.get(event.node_id)
+        if node_events is None:
+            node_events = events_by_node[event.node_id] = []
+        node_events.append(event)
 
         order.append(
             {
@@ -122,18 +163,26 @@ def summarise_trace(trace: ExecutionTrace) -> Dict[str, Any]:
         for successor in event.successors:
             edge_counts[(event.node_id, successor, event.status)] += 1
 
+    # Aggregate per node once the events are grouped: the "last_*" fields only
+    # need the final event, so earlier payloads are never converted or read.
     nodes_summary: Dict[str, Any] = {}
-    for node_id, data in node_data.items():
-        average_duration = data["total_duration"] / data["count"] if data["count"] else 0.0
+    for node_id, node_events in events_by_node.items():
+        count = len(node_events)
+        statuses: Dict[str, int] = {}
+        for event in node_events:
+            statuses[event.status] = statuses.get(event.status, 0) + 1
+        last = node_events[-1]
+        last_input = last.node_input
+        last_output = last.node_output
         nodes_summary[node_id] = {
-            "count": data["count"],
-            "statuses": dict(data["statuses"]),
-            "last_status": data["last_status"],
-            "last_duration": data["last_duration"],
-            "average_duration": average_duration,
-            "last_input": data["last_input"],
-            "last_output": data["last_output"],
-            "last_metadata": data["last_metadata"],
+            "count": count,
+            "statuses": statuses,
+            "last_status": last.status,
+            "last_duration": last.duration,
+            "average_duration": sum(map(_DURATION, node_events)) / count,
+            "last_input": last_input.get("data") if last_input else None,
+            "last_output": last_output.get("data") if last_output else None,
+            "last_metadata": last_output.get("metadata") if last_output else None,
         }
 
     edges_summary = [
@@ -163,6 +212,7 @@ def _build_node_label(
     definition: NodeDefinition,
     stats: Optional[Dict[str, Any]],
     include_metadata: bool,
+    cache: Optional[_FormatCache] = None,
 ) -> Tuple[str, int]:
     lines: List[str] = [node_id]
     if definition.name and definition.name != node_id:
@@ -176,14 +226,18 @@ def _build_node_label(
             if stats.get("last_duration") is not None:
                 lines.append(f"dur: {stats['last_duration']:.3f}s")
             if stats.get("last_input") is not None:
-                lines.append(_format_block("in", stats['last_input']))
+                lines.append(_format_block("in", stats['last_input'], cache))
             if stats.get("last_output") is not None:
-                lines.append(_format_block("out", stats['last_output']))
+                lines.append(_format_block("out", stats['last_output'], cache))
             if stats.get("last_metadata"):
-                lines.append(_format_block("meta", stats['last_metadata']))
+                lines.append(_format_block("meta", stats['last_metadata'], cache))
     return _format_label(lines)
 
 
+def _csv(values: Iterable[str]) -> str:
+    return ",".join(values)
+
+
 def render_mermaid_diagram(
     flow: FlowConfig,
     trace: Optional[ExecutionTrace] = None,
@@ -192,6 +246,15 @@ def render_mermaid_diagram(
     title: Optional[str] = None,
 ) -> str:
     summary = summarise_trace(trace) if trace else None
+    return "\n".join(_emit_mermaid_lines(flow, summary, include_metadata, title))
+
+
+def _emit_mermaid_lines(
+    flow: FlowConfig,
+    summary: Optional[Dict[str, Any]],
+    include_metadata: bool,
+    title: Optional[str],
+) -> Iterator[str]:
     node_stats = summary["nodes"] if summary else {}
     executed_nodes = set(node_stats.keys())
     executed_edges = {
@@ -199,27 +262,34 @@ def render_mermaid_diagram(
         for edge in summary["edges"]
     } if summary else {}
 
-    lines: List[str] = []
     if title:
-        lines.append(f"%% {title}")
-    lines.append(f"%% Flow: {flow.name}")
+        yield f"%% {title}"
+    yield f"%% Flow: {flow.name}"
     if summary:
-        lines.append(f"%% Executed events: {summary['events']}")
+        yield f"%% Executed events: {summary['events']}"
         order_preview = " -> ".join(f"{item['node_id']}({item['status']})" for item in summary["order"])
         if order_preview:
-            lines.append(f"%% Trace order: {order_preview}")
+            yield f"%% Trace order: {order_preview}"
 
-    lines.append("graph TD")
+    yield "graph TD"
 
+    # Nodes fed from the same trace payload share one formatted rendering.
+    format_cache: _FormatCache = {}
+    # Most nodes share one of a few widths, so widths are emitted as one class
+    # per distinct value rather than a style line per node.
+    width_buckets: Dict[int, List[str]] = {}
     for node_id, definition in flow.nodes.items():
         stats = node_stats.get(node_id)
-        label, max_len = _build_node_label(node_id, definition, stats, include_metadata)
+        label, max_len = _build_node_label(node_id, definition, stats, include_metadata, format_cache)
         base_width = _NODE_METADATA_WIDTH if include_metadata and stats else _NODE_BASE_WIDTH
         adjusted_width = max(base_width, max_len * _CHAR_PIXEL_WIDTH + _NODE_HORIZONTAL_PADDING)
         content = f"<div style=\"width:{int(adjusted_width - 20)}px;text-align:left\">{label}</div>"
         content = content.replace("\"", "&quot;")
-        lines.append(f"    {node_id}[\"{content}\"]")
-        lines.append(f"    style {node_id} width:{int(adjusted_width)}px")
+        yield f"    {node_id}[\"{content}\"]"
+        width_buckets.setdefault(int(adjusted_width), []).append(node_id)
+    for width, node_ids in width_buckets.items():
+        yield f"    classDef width{width} width:{width}px;"
+        yield f"    class {_csv(node_ids)} width{width};"
 
     edge_index = 0
     styled_edges: List[Tuple[int, int]] = []
@@ -234,26 +304,22 @@ def render_mermaid_diagram(
                     line = f"    {definition.id} --{label}--> {successor}"
                 else:
                     line = f"    {definition.id} --> {successor}"
-                lines.append(line)
-                key = (definition.id, successor, status)
-                if key in executed_edges:
-                    styled_edges.append((edge_index, executed_edges[key]))
+                yield line
+                count = executed_edges.get((definition.id, successor, status))
+                if count is not None:
+                    styled_edges.append((edge_index, count))
                 edge_index += 1
 
     if executed_nodes:
-        lines.append("    classDef executed fill:#bbf7d0,stroke:#15803d,stroke-width:2px,text-align:left;")
-        nodes_csv = ','.join(sorted(executed_nodes))
-        lines.append(f"    class {nodes_csv} executed;")
+        yield "    classDef executed fill:#bbf7d0,stroke:#15803d,stroke-width:2px,text-align:left;"
+        yield f"    class {_csv(sorted(executed_nodes))} executed;"
 
     if flow.start:
-        lines.append("    classDef start fill:#dbeafe,stroke:#1d4ed8,stroke-width:2px;")
-        start_csv = ','.join(flow.start)
-        lines.append(f"    class {start_csv} start;")
+        yield "    classDef start fill:#dbeafe,stroke:#1d4ed8,stroke-width:2px;"
+        yield f"    class {_csv(flow.start)} start;"
 
     for index, count in styled_edges:
-        lines.append(f"    linkStyle {index} stroke:#16a34a,stroke-width:3px;")
+        yield f"    linkStyle {index} stroke:#16a34a,stroke-width:3px;"
         if count > 1:
-            lines.append(f"    %% edge {index} executed {count} times")
-
-    return "\n".join(lines)
+            yield f"    %% edge {index} executed {count} times"
 
@@ -4,31 +4,144 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import sys
 import time
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Mapping, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Mapping, MutableSequence, Optional, Tuple
 
+from . import json_utils
 from .config import FlowConfig, GlobalConfig
-from .global_state import child_initializer, get_global_state, get_shared_proxy, set_initial_state
+from .global_state import (
+    child_initializer,
+    get_child_initargs,
+    get_global_state,
+    set_initial_state,
+)
 from .logging_utils import get_node_logger
-from .node import ExecutableNode, NodeInput, NodeOutput
+from .node import ExecutableNode, NodeExecutor, NodeInput, NodeOutput
+
+
+class _SharedPrimitive:
+    """Convert one :class:`NodeInput` at most once for every event that records it.
+
+    Fan-out siblings receive the same input object, so their events hold the same
+    holder and end up referencing a single primitive dictionary.
+    """
+
+    __slots__ = ("_source", "_value")
+
+    def __init__(self, source: NodeInput):
+        self._source: Optional[NodeInput] = source
+        self._value: Optional[Dict[str, Any]] = None
+
+    def get(self) -> Dict[str, Any]:
+        if self._source is not None:
+            self._value = self._source.to_primitive()
+            self._source = None
+        assert self._value is not None
+        return self._value
 
 
-@dataclass
 class ExecutionEvent:
-    """Single execution of a node within a flow run."""
+    """Single execution of a node within a flow run.
+
+    ``node_input`` and ``node_output`` may be given as the live
+    :class:`NodeInput` and :class:`NodeOutput` objects; they are converted to
+    primitives the first time the attributes are read, keeping that work off
+    the scheduling path.
+    """
+
+    __slots__ = (
+        "node_id",
+        "status",
+        "predecessor",
+        "started_at",
+        "finished_at",
+        "duration",
+        "_node_input",
+        "_node_output",
+        "successors",
+        "index",
+    )
+
+    _FIELDS = tuple(name.lstrip("_") for name in __slots__)
+
+    def __init__(
+        self,
+        node_id: str,
+        status: str,
+        predecessor: Optional[str],
+        started_at: float,
+        finished_at: float,
+        duration: float,
+        node_input: Any,
+        node_output: Any,
+        successors: List[str],
+        index: int = 0,
+    ) -> None:
+        self.node_id = node_id
+        self.status = status
+        self.predecessor = predecessor
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.duration = duration
+        self._node_input = node_input
+        self._node_output = node_output
+        self.successors = successors
+        self.index = index
+
+    @property
+    def node_input(self) -> Optional[Dict[str, Any]]:
+        raw = self._node_input
+        if isinstance(raw, _SharedPrimitive):
+            raw = self._node_input = raw.get()
+        elif isinstance(raw, NodeInput):
+            raw = self._node_input = raw.to_primitive()
+        return raw
+
+    @node_input.setter
+    def node_input(self, value: Optional[Dict[str, Any]]) -> None:
+        self._node_input = value
+
+    @property
+    def node_output(self) -> Dict[str, Any]:
+        raw = self._node_output
+        if isinstance(raw, NodeOutput):
+            raw = self._node_output = raw.to_primitive()
+        return raw
+
+    @node_output.setter
+    def node_output(self, value: Dict[str, Any]) -> None:
+        self._node_output = value
+
+    def _astuple(self) -> tuple:
+        return (
+            self.node_id,
+            self.status,
+            self.predecessor,
+            self.started_at,
+            self.finished_at,
+            self.duration,
+            self.node_input,
+            self.node_output,
+            self.successors,
+            self.index,
+        )
 
-    node_id: str
-    status: str
-    predecessor: Optional[str]
-    started_at: float
-    finished_at: float
-    duration: float
-    node_input: Optional[Dict[str, Any]]
-    node_output: Dict[str, Any]
-    successors: List[str]
-    index: int = field(default=0)
+    # Equality and repr behave like the dataclass this replaced, on the
+    # primitive values rather than the live node objects.
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()  # type: ignore[attr-defined]
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields_repr = ", ".join(f"{name}={value!r}" for name, value in zip(self._FIELDS, self._astuple()))
+        return f"{self.__class__.__qualname__}({fields_repr})"
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -46,31 +159,56 @@ class ExecutionEvent:
 
     @classmethod
     def from_dict(cls, data: Mapping[str, Any]) -> "ExecutionEvent":
+        # Ids and statuses repeat across thousands of events; interning them
+        # makes the dict lookups in summarise_trace compare by identity.
+        predecessor = data.get("predecessor")
         return cls(
-            node_id=str(data.get("node_id")),
-            status=str(data.get("status", "")),
-            predecessor=data.get("predecessor"),
+            node_id=sys.intern(str(data.get("node_id"))),
+            status=sys.intern(str(data.get("status", ""))),
+            predecessor=sys.intern(predecessor) if type(predecessor) is str else predecessor,
             started_at=float(data.get("started_at", 0.0)),
             finished_at=float(data.get("finished_at", 0.0)),
             duration=float(data.get("duration", 0.0)),
             node_input=data.get("node_input"),
             node_output=dict(data.get("node_output") or {}),
-            successors=list(data.get("successors", [])),
+            successors=[sys.intern(item) if type(item) is str else item for item in data.get("successors", [])],
             index=int(data.get("index", 0)),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionTrace:
-    """Ordered collection of node execution events."""
+    """Ordered collection of node execution events.
+
+    When ``sink`` is set every event is passed to it as it is recorded. With
+    ``max_events`` only the most recent events stay in :attr:`events`; event
+    indices keep counting across the whole run either way.
+    """
 
     flow_name: str
     started_at: float = field(default_factory=time.time)
     finished_at: Optional[float] = None
-    events: List[ExecutionEvent] = field(default_factory=list)
+    events: MutableSequence[ExecutionEvent] = field(default_factory=list)
+    sink: Optional[Callable[[ExecutionEvent], None]] = field(default=None, repr=False, compare=False)
+    max_events: Optional[int] = None
+    event_count: int = field(default=0, init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.max_events is not None:
+            self.events = deque(self.events, maxlen=self.max_events)
 
     def add_event(self, event: ExecutionEvent) -> ExecutionEvent:
-        event.index = len(self.events)
+        event.index = self.event_count
+        self.event_count += 1
+        if self.sink is not None:
+            # The sink runs inside the worker that recorded the event; a payload
+            # it cannot encode must not abort the flow itself.
+            try:
+                self.sink(event)
+            except Exception:
+                logging.getLogger("conductor.flow").exception(
+                    "Trace sink failed to record event %s for node '%s'", event.index, event.node_id
+                )
         self.events.append(event)
         return event
 
@@ -97,7 +235,31 @@ class ExecutionTrace:
         return trace
 
 
-@dataclass
+class JSONLinesEventSink:
+    """Append each trace event to ``path`` as one JSON document per line."""
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self._handle: Optional[BinaryIO] = open(path, "wb", buffering=1 << 16)
+
+    def __call__(self, event: ExecutionEvent) -> None:
+        if self._handle is None:
+            raise ValueError("Event sink is closed.")
+        self._handle.write(json_utils.dumps_bytes(event.to_dict()))
+        self._handle.write(b"\n")
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> "JSONLinesEventSink":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+@dataclass(slots=True)
 class FlowResult:
     """Represents the terminal output of a node."""
 
@@ -111,12 +273,24 @@ class FlowResult:
 class FlowExecutor:
     """Coordinate the execution of nodes according to the flow definition."""
 
-    def __init__(self, flow: FlowConfig, global_config: Optional[GlobalConfig] = None, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        flow: FlowConfig,
+        global_config: Optional[GlobalConfig] = None,
+        logger: Optional[logging.Logger] = None,
+        *,
+        event_sink: Optional[Callable[[ExecutionEvent], None]] = None,
+        max_trace_events: Optional[int] = None,
+    ):
         self.flow = flow
+        self.event_sink = event_sink
+        self.max_trace_events = max_trace_events
         self.global_config = global_config or GlobalConfig.from_mapping({})
         self.logger = logger or logging.getLogger("conductor.flow")
         self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
         self._requires_pool = any(node.executor == "process" for node in self.flow.nodes.values())
+        self._requires_thread_pool = any(node.executor == "thread" for node in self.flow.nodes.values())
         self._nodes: Dict[str, ExecutableNode] = {}
         self.global_state = get_global_state()
         self.trace: Optional[ExecutionTrace] = None
@@ -129,14 +303,34 @@ class FlowExecutor:
             set_initial_state(self.global_config.shared_state)
 
         if self._requires_pool:
+            # Workers import the process callables while starting up.
+            process_callables = sorted(
+                {node.callable for node in self.flow.nodes.values() if node.executor == "process" and node.callable}
+            )
             self._process_pool = ProcessPoolExecutor(
                 max_workers=self.global_config.process_pool_size,
                 initializer=child_initializer,
-                initargs=(get_shared_proxy(),),
+                initargs=get_child_initargs(process_callables),
+            )
+
+        if self._requires_thread_pool:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.global_config.thread_pool_size,
+                thread_name_prefix="conductor-node",
             )
 
+        # Successors keyed by (node_id, status); (node_id, None) holds the default route.
+        self._next: Dict[Tuple[str, Optional[str]], Tuple[str, ...]] = {}
+        # Nodes running the same callable share an executor for this flow only,
+        # so nothing outlives the pools created above.
+        shared_executors: Dict[tuple, NodeExecutor] = {}
         for node_id, node in self.flow.nodes.items():
-            self._nodes[node_id] = ExecutableNode(node, self.global_config, self._process_pool)
+            self._nodes[node_id] = ExecutableNode(
+                node, self.global_config, self._process_pool, self._thread_pool, shared_executors
+            )
+            for status in node.transitions:
+                self._next[(node_id, status)] = self.flow.next_nodes(node_id, status)
+            self._next[(node_id, None)] = self.flow.next_nodes(node_id, "default")
 
         self._concurrency = self.global_config.max_concurrency or len(self._nodes) or 1
         self.logger.debug(
@@ -150,77 +344,121 @@ class FlowExecutor:
         if self._process_pool:
             self._process_pool.shutdown(wait=True)
             self._process_pool = None
+        if self._thread_pool:
+            self._thread_pool.shutdown(wait=True)
+            self._thread_pool = None
 
     async def run(self, initial_payload: Any = None) -> List[FlowResult]:
-        self.trace = ExecutionTrace(flow_name=self.flow.name)
-        queue: asyncio.Queue[Tuple[Optional[str], Optional[NodeInput], Optional[str]]] = asyncio.Queue()
+        self.trace = ExecutionTrace(
+            flow_name=self.flow.name, sink=self.event_sink, max_events=self.max_trace_events
+        )
+        # Every worker shares one event loop, so a plain deque plus a wake-up
+        # event replaces asyncio.Queue and its per-item future bookkeeping.
+        pending: Deque[Tuple[str, NodeInput, Optional[str], Optional[_SharedPrimitive]]] = deque()
+        notify = asyncio.Event()
+        inflight = 0
         for node_id in self.flow.start:
-            await queue.put((node_id, NodeInput.from_value(initial_payload), None))
+            pending.append((node_id, NodeInput.from_value(initial_payload), None, None))
             self.logger.debug("Scheduled start node '%s'", node_id)
 
         results: List[FlowResult] = []
         worker_count = max(1, self._concurrency)
-        sentinel: Tuple[Optional[str], Optional[NodeInput], Optional[str]] = (None, None, None)
+        # Wall-clock timestamps are derived from one monotonic clock read per
+        # boundary, offset from a single wall-clock sample taken here.
+        wall_base = time.time()
+        perf_base = time.perf_counter_ns()
 
         async def worker(worker_id: int) -> None:
+            nonlocal inflight
             worker_logger = get_node_logger(f"worker.{worker_id}")
+            # Sampled once per run so idle debug calls cost a bool test per event.
+            debug_enabled = worker_logger.isEnabledFor(logging.DEBUG)
             while True:
-                node_id, node_input, predecessor = await queue.get()
-                if node_id is None:
-                    queue.task_done()
-                    worker_logger.debug("Worker %s received shutdown signal", worker_id)
-                    break
-                worker_logger.debug("Worker %s executing node '%s'", worker_id, node_id)
-                try:
-                    node = self._nodes[node_id]
-                except KeyError:
-                    self.logger.error("Received task for unknown node '%s'", node_id)
-                    queue.task_done()
+                if not pending:
+                    if not inflight:
+                        # Nothing queued and nothing running: the flow is done.
+                        notify.set()
+                        if debug_enabled:
+                            worker_logger.debug("Worker %s received shutdown signal", worker_id)
+                        break
+                    notify.clear()
+                    await notify.wait()
                     continue
-                started_wall = time.time()
-                started_perf = time.perf_counter()
+                node_id, node_input, predecessor, recorded_input = pending.popleft()
+                inflight += 1
                 try:
-                    output = await node.execute(node_input, predecessor)
-                except Exception as exc:  # pragma: no cover - node execution already handles errors
-                    self.logger.exception("Unhandled exception while executing node '%s'", node_id)
-                    output = NodeOutput(status="error", data={"error": str(exc)})
-                finished_wall = time.time()
-                next_nodes = self.flow.next_nodes(node_id, output.status)
-                if not next_nodes:
-                    results.append(FlowResult(node_id=node_id, output=output))
+                    await run_task(
+                        worker_logger, debug_enabled, worker_id, node_id, node_input, predecessor, recorded_input
+                    )
+                finally:
+                    inflight -= 1
+                if not inflight and not pending:
+                    notify.set()
+
+        async def run_task(
+            worker_logger: logging.Logger,
+            debug_enabled: bool,
+            worker_id: int,
+            node_id: str,
+            node_input: NodeInput,
+            predecessor: Optional[str],
+            recorded_input: Optional[_SharedPrimitive],
+        ) -> None:
+            if debug_enabled:
+                worker_logger.debug("Worker %s executing node '%s'", worker_id, node_id)
+            try:
+                node = self._nodes[node_id]
+            except KeyError:
+                self.logger.error("Received task for unknown node '%s'", node_id)
+                return
+            started_ns = time.perf_counter_ns()
+            try:
+                output = await node.execute(node_input, predecessor)
+            except Exception as exc:  # pragma: no cover - node execution already handles errors
+                self.logger.exception("Unhandled exception while executing node '%s'", node_id)
+                output = NodeOutput(status="error", data={"error": str(exc)})
+            finished_ns = time.perf_counter_ns()
+            next_nodes = self._next.get((node_id, output.status))
+            if next_nodes is None:
+                next_nodes = self._next.get((node_id, None), ())
+            if not next_nodes:
+                results.append(FlowResult(node_id=node_id, output=output))
+                if debug_enabled:
                     worker_logger.debug("Node '%s' reached terminal state", node_id)
-                else:
-                    for successor in next_nodes:
-                        await queue.put((successor, NodeInput.from_value(output, predecessor=node_id), node_id))
-                        worker_logger.debug(
-                            "Node '%s' scheduled successor '%s' due to status '%s'", node_id, successor, output.status
-                        )
-
-                if self.trace is not None:
-                    primitive_input = node_input.to_primitive() if node_input else None
-                    primitive_output = output.to_primitive()
-                    duration = output.metadata.get("duration") if output.metadata else None
-                    if duration is None:
-                        duration = time.perf_counter() - started_perf
-                    event = ExecutionEvent(
-                        node_id=node_id,
-                        status=output.status,
-                        predecessor=predecessor,
-                        started_at=started_wall,
-                        finished_at=finished_wall,
-                        duration=float(duration),
-                        node_input=primitive_input,
-                        node_output=primitive_output,
-                        successors=list(next_nodes),
+            else:
+                # ExecutableNode.execute copies its input before use, so every
+                # branch of a fan-out can be handed the same NodeInput.
+                successor_input = NodeInput.from_value(output, predecessor=node_id)
+                shared = _SharedPrimitive(successor_input) if len(next_nodes) > 1 else None
+                for successor in next_nodes:
+                    pending.append((successor, successor_input, node_id, shared))
+                notify.set()
+                if debug_enabled:
+                    worker_logger.debug(
+                        "Node '%s' scheduled successor(s) %s due to status '%s'",
+                        node_id,
+                        ", ".join(f"'{successor}'" for successor in next_nodes),
+                        output.status,
                     )
-                    self.trace.add_event(event)
 
-                queue.task_done()
+            if self.trace is not None:
+                duration = output.metadata.get("duration") if output.metadata else None
+                if duration is None:
+                    duration = (finished_ns - started_ns) / 1e9
+                event = ExecutionEvent(
+                    node_id=node_id,
+                    status=output.status,
+                    predecessor=predecessor,
+                    started_at=wall_base + (started_ns - perf_base) / 1e9,
+                    finished_at=wall_base + (finished_ns - perf_base) / 1e9,
+                    duration=float(duration),
+                    node_input=recorded_input or node_input,
+                    node_output=output,
+                    successors=list(next_nodes),
+                )
+                self.trace.add_event(event)
 
         workers = [asyncio.create_task(worker(index)) for index in range(worker_count)]
-        await queue.join()
-        for _ in workers:
-            await queue.put(sentinel)
         await asyncio.gather(*workers)
         if self.trace is not None:
             self.trace.mark_finished()
@@ -237,5 +475,8 @@ class FlowExecutor:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        self.shutdown()
+        if self._process_pool is None and self._thread_pool is None:
+            return
+        # Joining the pools blocks until their workers exit; do it off the event loop.
+        await asyncio.to_thread(self.shutdown)
 
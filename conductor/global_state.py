@@ -1,87 +1,305 @@
 ﻿"""Shared state utilities available to all nodes."""
 from __future__ import annotations
 
-import asyncio
-from multiprocessing import Manager
-from threading import Lock
-from typing import Any, Dict, Iterable, MutableMapping, Optional
+from multiprocessing import Manager, Value
+from threading import Lock, RLock
+from types import MappingProxyType
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
 
-__all__ = ["GlobalState", "get_global_state", "set_initial_state", "child_initializer", "get_shared_proxy"]
+from .utils import preload_callables
+
+__all__ = [
+    "GlobalState",
+    "StatePipeline",
+    "get_global_state",
+    "set_initial_state",
+    "child_initializer",
+    "get_shared_proxy",
+    "get_shared_lock",
+    "get_child_initargs",
+    "promote_to_shared",
+]
 
 _MANAGER: Optional[Manager] = None
 _SHARED_PROXY: Optional[MutableMapping[str, Any]] = None
+_SHARED_LOCK: Optional[ContextManager[Any]] = None
+_SHARED_VERSION: Optional[Any] = None
 _GLOBAL_STATE: Optional["GlobalState"] = None
 _INIT_LOCK = Lock()
+_MISSING = object()
+# Values of these types can be served from the per-process caches: callers
+# cannot change them in place, so a cached value always matches the storage.
+_IMMUTABLE_TYPES = frozenset({str, int, float, bool, bytes, complex, type(None)})
 
 
 class GlobalState:
     """Container for shared state accessible from inline and process nodes."""
 
-    def __init__(self, storage: MutableMapping[str, Any]):
+    def __init__(
+        self,
+        storage: MutableMapping[str, Any],
+        lock: Optional[ContextManager[Any]] = None,
+        version: Optional[Any] = None,
+    ):
         self._storage = storage
-        self._lock = asyncio.Lock()
+        # Single-key writes are atomic on a dict and on a manager proxy alike;
+        # only read-modify-write updates take this lock.
+        self._atomic_lock = lock if lock is not None else RLock()
+        # Shared storage is paired with a counter in shared memory that every
+        # write bumps. Reads are served from a per-process cache until the
+        # counter moves, so repeated reads skip the manager round-trip.
+        self._version = version
+        self._cache: Dict[str, Any] = {}
+        self._cache_version = -1
+        # Snapshots are taken at a version and never mutated afterwards; local
+        # storage counts its writes in ``_generation`` instead.
+        self._generation = 0
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_version = -1
+        self._snapshot_immutable = False
+
+    def _written(self) -> None:
+        version = self._version
+        if version is None:
+            self._generation += 1
+            return
+        with version.get_lock():
+            version.value += 1
+
+    def _current_snapshot(self) -> Dict[str, Any]:
+        version = self._version
+        current = self._generation if version is None else version.value
+        snapshot = self._snapshot
+        if snapshot is None or current != self._snapshot_version:
+            # ``copy`` is a single call on a manager proxy; ``dict()`` fetches key by key.
+            snapshot = self._snapshot = self._storage.copy()
+            self._snapshot_version = current
+            self._snapshot_immutable = all(type(value) in _IMMUTABLE_TYPES for value in snapshot.values())
+        return snapshot
 
     # ------------------------------------------------------------------
     # Async API
     # ------------------------------------------------------------------
     async def set(self, key: str, value: Any) -> None:
-        async with self._lock:
-            self._storage[key] = value
+        self.set_sync(key, value)
 
     async def get(self, key: str, default: Any = None) -> Any:
-        return self._storage.get(key, default)
+        return self.get_sync(key, default)
 
     async def delete(self, key: str) -> None:
-        async with self._lock:
-            self._storage.pop(key, None)
+        self.delete_sync(key)
 
     async def update(self, mapping: MutableMapping[str, Any] | Iterable[tuple[str, Any]]) -> None:
-        async with self._lock:
-            if isinstance(mapping, MutableMapping):
-                self._storage.update(mapping)
-            else:
-                for key, value in mapping:
-                    self._storage[key] = value
+        self.update_sync(mapping)
+
+    async def update_atomic(self, key: str, fn: Callable[[Any], Any], default: Any = None) -> Any:
+        return self.update_atomic_sync(key, fn, default)
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        return self.incr_sync(key, amount)
 
     # ------------------------------------------------------------------
     # Sync helpers (usable from node code running in threads/processes)
     # ------------------------------------------------------------------
     def set_sync(self, key: str, value: Any) -> None:
         self._storage[key] = value
+        self._written()
 
     def get_sync(self, key: str, default: Any = None) -> Any:
-        return self._storage.get(key, default)
+        version = self._version
+        if version is None:
+            return self._storage.get(key, default)
+        # Read the counter before the value: a write racing with the fetch
+        # moves the counter, so the next read drops what was cached here.
+        current = version.value
+        cache = self._cache
+        if current != self._cache_version:
+            cache.clear()
+            self._cache_version = current
+        try:
+            value = cache[key]
+        except KeyError:
+            value = self._storage.get(key, _MISSING)
+            # Lists, dicts and other mutable values are fetched on every read,
+            # like plain proxy reads, so in-place changes to one copy stay local.
+            if value is _MISSING or type(value) in _IMMUTABLE_TYPES:
+                cache[key] = value
+        return default if value is _MISSING else value
 
     def delete_sync(self, key: str) -> None:
         self._storage.pop(key, None)
+        self._written()
 
     def update_sync(self, mapping: MutableMapping[str, Any] | Iterable[tuple[str, Any]]) -> None:
-        if isinstance(mapping, MutableMapping):
-            self._storage.update(mapping)
-        else:
-            for key, value in mapping:
-                self._storage[key] = value
+        # One update call is a single round-trip for manager-backed storage.
+        self._storage.update(mapping if isinstance(mapping, MutableMapping) else dict(mapping))
+        self._written()
+
+    def update_atomic_sync(self, key: str, fn: Callable[[Any], Any], default: Any = None) -> Any:
+        """Replace ``key`` with ``fn(current)`` without interleaving other atomic updates.
+
+        ``default`` is passed to ``fn`` when the key is missing. The new value is
+        returned. Once the state is shared the lock spans every worker process.
+        """
+        with self._atomic_lock:
+            value = fn(self._storage.get(key, default))
+            self._storage[key] = value
+            self._written()
+        return value
+
+    def pipeline(self) -> "StatePipeline":
+        """Return a batch of writes that :meth:`StatePipeline.execute` applies together."""
+        return StatePipeline(self)
+
+    def _apply_pipeline(self, ops: List[Tuple[str, str, Any]]) -> List[Any]:
+        results: List[Any] = []
+        final: Dict[str, Any] = {}
+        with self._atomic_lock:
+            storage = self._storage
+            for op, key, value in ops:
+                if op == "incr":
+                    current = final[key] if key in final else storage.get(key, 0)
+                    value = (0 if current is _MISSING else current) + value
+                    results.append(value)
+                else:
+                    results.append(None)
+                final[key] = _MISSING if op == "delete" else value
+            # Only the final value of each key is written, in one update call.
+            writes = {key: value for key, value in final.items() if value is not _MISSING}
+            if writes:
+                storage.update(writes)
+            for key, value in final.items():
+                if value is _MISSING:
+                    storage.pop(key, None)
+            if final:
+                self._written()
+        return results
+
+    def incr_sync(self, key: str, amount: int = 1) -> int:
+        """Atomically add ``amount`` to the counter ``key`` and return its new value.
+
+        A missing key counts as 0.
+        """
+        with self._atomic_lock:
+            value = self._storage.get(key, 0) + amount
+            self._storage[key] = value
+            self._written()
+        return value
 
     def to_dict(self) -> Dict[str, Any]:
-        return dict(self._storage)
+        if self._version is None:
+            return self._storage.copy()
+        # Shared storage is fetched again only after a write moves the counter;
+        # callers get their own copy of the local snapshot. Snapshots holding
+        # mutable values are not reused, since callers could change them in place.
+        snapshot = self._current_snapshot()
+        if self._snapshot_immutable:
+            return dict(snapshot)
+        return self._storage.copy()
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """Return a read-only view of the state as of the last write.
+
+        The view is reused until the state is written again, so read-only
+        callers avoid the copy made by :meth:`to_dict`. Later writes do not
+        show up in a view that was already returned. Nested values are shared
+        with later views and must not be changed in place.
+        """
+        return MappingProxyType(self._current_snapshot())
 
     def get_proxy(self):
         """Return the underlying proxy object for multiprocessing initialisation."""
         return self._storage
 
+    def _replace_storage(self, storage: MutableMapping[str, Any], lock: ContextManager[Any], version: Any) -> None:
+        # Swapping the backing mapping in place keeps references held by
+        # callers (for example ``FlowExecutor.global_state``) valid.
+        with self._atomic_lock:
+            storage.update(self._storage)
+            self._storage = storage
+            self._atomic_lock = lock
+            self._version = version
+            self._cache.clear()
+            self._snapshot = None
+
+
+class StatePipeline:
+    """Queued writes applied in one step under the state's atomic lock.
+
+    Used as a context manager, queued operations are executed on a clean exit
+    and their results are available from :attr:`results` after the block.
+    """
+
+    __slots__ = ("_state", "_ops", "results")
+
+    def __init__(self, state: GlobalState):
+        self._state = state
+        self._ops: List[Tuple[str, str, Any]] = []
+        #: Results of the last :meth:`execute`, one per operation.
+        self.results: List[Any] = []
+
+    def set(self, key: str, value: Any) -> None:
+        self._ops.append(("set", key, value))
+
+    def delete(self, key: str) -> None:
+        self._ops.append(("delete", key, None))
+
+    def incr(self, key: str, amount: int = 1) -> None:
+        """Queue adding ``amount`` to ``key``; a missing key counts as 0."""
+        self._ops.append(("incr", key, amount))
+
+    def execute(self) -> List[Any]:
+        """Apply the queued operations and return one result per operation.
+
+        ``incr`` results are the new values; ``set`` and ``delete`` give ``None``.
+        """
+        ops, self._ops = self._ops, []
+        self.results = self._state._apply_pipeline(ops) if ops else []
+        return self.results
+
+    def __enter__(self) -> "StatePipeline":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None and self._ops:
+            self.execute()
+
 
 def _ensure_state() -> None:
-    global _MANAGER, _SHARED_PROXY, _GLOBAL_STATE
+    global _GLOBAL_STATE
     if _GLOBAL_STATE is not None:
         return
     with _INIT_LOCK:
         if _GLOBAL_STATE is not None:
             return
+        # A plain dict is enough until a process pool needs to see the state.
+        _GLOBAL_STATE = GlobalState({})
+
+
+def promote_to_shared() -> None:
+    """Move the global state into a ``multiprocessing.Manager`` dictionary.
+
+    Only flows with process nodes need cross-process state, so the manager
+    process is started here on demand rather than on first access. Existing
+    entries are copied across and the :class:`GlobalState` object is reused.
+    """
+    global _MANAGER, _SHARED_PROXY, _SHARED_LOCK, _SHARED_VERSION
+    _ensure_state()
+    if _SHARED_PROXY is not None:
+        return
+    with _INIT_LOCK:
+        if _SHARED_PROXY is not None:
+            return
         manager = Manager()
         proxy = manager.dict()
+        lock = manager.RLock()
+        version = Value("Q", 0)
+        assert _GLOBAL_STATE is not None
+        _GLOBAL_STATE._replace_storage(proxy, lock, version)
         _MANAGER = manager
+        _SHARED_LOCK = lock
+        _SHARED_VERSION = version
         _SHARED_PROXY = proxy
-        _GLOBAL_STATE = GlobalState(proxy)
 
 
 def get_global_state() -> GlobalState:
@@ -97,18 +315,46 @@ def set_initial_state(data: Optional[Dict[str, Any]] = None) -> None:
     state.update_sync(data)
 
 
-def _set_proxy(proxy: MutableMapping[str, Any]) -> None:
-    global _SHARED_PROXY, _GLOBAL_STATE
+def _set_proxy(
+    proxy: MutableMapping[str, Any], lock: Optional[ContextManager[Any]] = None, version: Optional[Any] = None
+) -> None:
+    global _SHARED_PROXY, _SHARED_LOCK, _SHARED_VERSION, _GLOBAL_STATE
     _SHARED_PROXY = proxy
-    _GLOBAL_STATE = GlobalState(proxy)
+    _SHARED_LOCK = lock
+    _SHARED_VERSION = version
+    _GLOBAL_STATE = GlobalState(proxy, lock, version)
+
 
+def child_initializer(
+    proxy: MutableMapping[str, Any],
+    lock: Optional[ContextManager[Any]] = None,
+    version: Optional[Any] = None,
+    callable_paths: Iterable[str] = (),
+) -> None:  # pragma: no cover - executed in child processes
+    """Initializer used by worker processes to reuse the parent's shared state.
 
-def child_initializer(proxy: MutableMapping[str, Any]) -> None:  # pragma: no cover - executed in child processes
-    """Initializer used by worker processes to reuse the parent's shared state."""
-    _set_proxy(proxy)
+    ``callable_paths`` are imported up front so the first task sent to a fresh
+    worker does not pay for the import.
+    """
+    _set_proxy(proxy, lock, version)
+    if callable_paths:
+        preload_callables(callable_paths)
 
 
 def get_shared_proxy():
-    _ensure_state()
+    promote_to_shared()
     assert _SHARED_PROXY is not None
     return _SHARED_PROXY
+
+
+def get_shared_lock():
+    """Return the manager lock guarding atomic updates of the shared state."""
+    promote_to_shared()
+    assert _SHARED_LOCK is not None
+    return _SHARED_LOCK
+
+
+def get_child_initargs(callable_paths: Iterable[str] = ()) -> tuple:
+    """Return the ``initargs`` that let :func:`child_initializer` attach to the shared state."""
+    promote_to_shared()
+    return (_SHARED_PROXY, _SHARED_LOCK, _SHARED_VERSION, tuple(callable_paths))
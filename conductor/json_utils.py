@@ -0,0 +1,93 @@
+"""JSON helpers that prefer a C-accelerated backend when one is installed.
+
+For values the standard library can encode, backends differ only in
+whitespace. They agree that non-ASCII text is written as UTF-8 rather than ``\\u`` escapes, and non-finite floats are written as ``NaN`` and
+``Infinity`` the way the standard library does (orjson would emit ``null``, so
+such values are encoded by the standard library instead). Documents containing
+those tokens are parsed by the standard library as well.
+"""
+from __future__ import annotations
+
+import json
+import math
+from typing import Any
+
+try:  # pragma: no cover - optional import
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional import
+    import ujson  # type: ignore
+except ImportError:  # pragma: no cover - ujson is optional
+    ujson = None  # type: ignore[assignment]
+
+__all__ = ["loads", "dumps", "dumps_bytes"]
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document from text or UTF-8 encoded bytes."""
+
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity; anything else fails again below.
+            return json.loads(data)
+    if ujson is not None:
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            return json.loads(data)
+    return json.loads(data)
+
+
+def _has_non_finite(value: Any) -> bool:
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _stdlib_dumps(value: Any, indent: bool) -> str:
+    return json.dumps(value, indent=2 if indent else None, ensure_ascii=False)
+
+
+def dumps_bytes(value: Any, *, indent: bool = False) -> bytes:
+    """Serialise ``value`` to UTF-8 encoded JSON, optionally indented by two spaces."""
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            data = orjson.dumps(value, option=option)
+        except TypeError:
+            # orjson rejects integers wider than 64 bits; the stdlib does not.
+            return _stdlib_dumps(value, indent).encode("utf-8")
+        # orjson writes non-finite floats as null; only documents containing
+        # null need the scan for them.
+        if b"null" in data and _has_non_finite(value):
+            return _stdlib_dumps(value, indent).encode("utf-8")
+        return data
+    return dumps(value, indent=indent).encode("utf-8")
+
+
+def dumps(value: Any, *, indent: bool = False) -> str:
+    """Serialise ``value`` to a JSON string, optionally indented by two spaces."""
+
+    if orjson is not None:
+        return dumps_bytes(value, indent=indent).decode("utf-8")
+    if ujson is not None:
+        try:
+            return ujson.dumps(value, indent=2 if indent else 0, ensure_ascii=False, escape_forward_slashes=False)
+        except (OverflowError, TypeError):
+            pass
+    return _stdlib_dumps(value, indent)
@@ -1,21 +1,41 @@
 """Logging helpers with optional remote delivery."""
 from __future__ import annotations
 
-import json
 import logging
+import os
+import queue
 import ssl
 import sys
+import threading
+import time
+from http import client
 from logging import Handler
-from typing import Optional
+from multiprocessing import util as mp_util
+from typing import Any, Dict, List, Optional
 from urllib import request
+from urllib.parse import urlsplit, urlunsplit
 
+from . import json_utils
 from .config import GlobalConfig, RemoteLoggingConfig
 
 LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
 
+_REMOTE_TIMEOUT = 10.0
+_STOP = object()
+_TIME_FORMATTER = logging.Formatter()
+
 
 class RemoteLogHandler(Handler):
-    """Send log records to a remote HTTP endpoint."""
+    """Send log records to a remote HTTP endpoint.
+
+    Records are queued by :meth:`emit` and posted from a background thread over
+    one keep-alive connection, so logging never waits on the network. With
+    ``batch_size`` above one, up to that many records are sent together as a
+    JSON array, at the latest ``flush_interval`` seconds after the first.
+
+    Targets reached through a configured proxy, or over schemes other than
+    HTTP(S), are posted with :mod:`urllib.request`, which also follows redirects.
+    """
 
     def __init__(self, config: RemoteLoggingConfig):
         super().__init__()
@@ -24,22 +44,143 @@ class RemoteLogHandler(Handler):
         if not config.verify:
             self._context.check_hostname = False
             self._context.verify_mode = ssl.CERT_NONE
-
-    def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover - network side effects
-        payload = {
-            "level": record.levelname,
-            "message": record.getMessage(),
-            "logger": record.name,
-            "time": self.formatTime(record),
-            "module": record.module,
-        }
-        data = json.dumps(payload).encode("utf-8")
-        req = request.Request(self._config.target, data=data, method=self._config.method.upper())
-        req.add_header("Content-Type", "application/json")
-        for header_name, header_value in self._config.headers.items():
-            req.add_header(header_name, header_value)
+        parts = urlsplit(config.target)
+        self._scheme = parts.scheme.lower()
+        self._host = parts.hostname or ""
+        self._port = parts.port
+        self._path = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        self._headers = {"Content-Type": "application/json", **config.headers}
+        self._use_urllib = self._scheme not in {"http", "https"} or self._scheme in request.getproxies()
+        self._connection: Optional[client.HTTPConnection] = None
+        self._time_second = -1
+        self._time_prefix = ""
+        self._start()
+
+    def _start(self) -> None:
+        self._pid = os.getpid()
+        self._connection = None
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="conductor-remote-log", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self._pid != os.getpid():
+                # A forked worker inherits the handler but not its sender
+                # thread; start a fresh one (with its own queue and connection)
+                # and deliver the backlog when the worker process exits, since
+                # multiprocessing skips atexit handlers there.
+                self._start()
+                mp_util.Finalize(self, self.close, exitpriority=10)
+            self._queue.put(
+                {
+                    "level": record.levelname,
+                    "message": record.getMessage(),
+                    "logger": record.name,
+                    "time": self._format_time(record),
+                    "module": record.module,
+                }
+            )
+        except Exception:  # pragma: no cover - mirrors logging.Handler semantics
+            self.handleError(record)
+
+    def _format_time(self, record: logging.LogRecord) -> str:
+        # Same text as Formatter.formatTime(record); the strftime part only
+        # changes once per second, so it is reused between records.
+        formatter = self.formatter or _TIME_FORMATTER
+        second = int(record.created)
+        if second != self._time_second:
+            self._time_prefix = time.strftime(formatter.default_time_format, formatter.converter(record.created))
+            self._time_second = second
+        if formatter.default_msec_format:
+            return formatter.default_msec_format % (self._time_prefix, record.msecs)
+        return self._time_prefix
+
+    def flush(self) -> None:
+        """Block until the records queued so far have been sent."""
+        if self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(_REMOTE_TIMEOUT)
+
+    def close(self) -> None:
+        # logging.shutdown() calls this at exit, which delivers pending records.
+        if self._pid == os.getpid() and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(_REMOTE_TIMEOUT)
+        super().close()
+
+    def _run(self) -> None:  # pragma: no cover - network side effects
+        batch: List[Dict[str, Any]] = []
+        deadline = 0.0
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()) if batch else None)
+            except queue.Empty:
+                item = None
+            if type(item) is dict:
+                if not batch:
+                    deadline = time.monotonic() + self._config.flush_interval
+                batch.append(item)
+                if len(batch) < self._config.batch_size:
+                    continue
+            if batch:
+                self._send(batch)
+                batch = []
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                if self._connection is not None:
+                    self._connection.close()
+                    self._connection = None
+                return
+
+    def _connect(self) -> client.HTTPConnection:
+        if self._scheme == "https":
+            return client.HTTPSConnection(self._host, self._port, timeout=_REMOTE_TIMEOUT, context=self._context)
+        if self._scheme == "http":
+            return client.HTTPConnection(self._host, self._port, timeout=_REMOTE_TIMEOUT)
+        raise ValueError(f"Unsupported remote logging target '{self._config.target}'.")
+
+    def _send(self, batch: List[Dict[str, Any]]) -> None:  # pragma: no cover - network side effects
+        body = json_utils.dumps_bytes(batch if self._config.batch_size > 1 else batch[0])
+        if self._use_urllib:
+            self._send_with_urllib(body)
+            return
+        for attempt in range(2):
+            reused = self._connection is not None
+            sent = False
+            try:
+                if self._connection is None:
+                    self._connection = self._connect()
+                self._connection.request(self._config.method.upper(), self._path, body=body, headers=self._headers)
+                sent = True
+                response = self._connection.getresponse()
+                response.read()
+                if 300 <= response.status < 400:
+                    # Redirects are rare for a log collector; let urllib follow them.
+                    self._send_with_urllib(body)
+                elif response.status >= 400:
+                    print(f"Failed to emit remote log: HTTP {response.status} {response.reason}", file=sys.stderr)
+                return
+            except Exception as exc:  # pragma: no cover - best effort logging
+                if self._connection is not None:
+                    self._connection.close()
+                    self._connection = None
+                # A kept-alive connection the server already dropped fails while
+                # sending, or is closed with no response at all; only then can the
+                # record be re-sent on a new connection without posting it twice.
+                stale = isinstance(exc, client.RemoteDisconnected) or (not sent and isinstance(exc, OSError))
+                if reused and stale and attempt == 0:
+                    continue
+                print(f"Failed to emit remote log: {exc}", file=sys.stderr)
+                return
+
+    def _send_with_urllib(self, body: bytes) -> None:  # pragma: no cover - network side effects
+        req = request.Request(self._config.target, data=body, headers=self._headers, method=self._config.method.upper())
         try:
-            with request.urlopen(req, context=self._context) as response:
+            with request.urlopen(req, timeout=_REMOTE_TIMEOUT, context=self._context) as response:
                 response.read()
         except Exception as exc:  # pragma: no cover - best effort logging
             print(f"Failed to emit remote log: {exc}", file=sys.stderr)
@@ -50,6 +191,9 @@ def configure_logging(config: Optional[GlobalConfig], level: int = logging.INFO)
 
     logger = logging.getLogger("conductor")
     logger.setLevel(level)
+    for handler in logger.handlers:
+        if isinstance(handler, RemoteLogHandler):
+            handler.close()
     logger.handlers = []
 
     stream_handler = logging.StreamHandler()
@@ -3,19 +3,19 @@ from __future__ import annotations
 
 import asyncio
 import inspect
-import json
 import time
 from asyncio import subprocess
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Protocol
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Protocol
 
 from .config import GlobalConfig, NodeDefinition
 from .logging_utils import get_node_logger
-from . import utils
+from . import json_utils, utils
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeInput:
     """Standardised payload flowing between nodes."""
 
@@ -25,22 +25,10 @@ class NodeInput:
 
     @classmethod
     def from_value(cls, value: Any, predecessor: Optional[str] = None) -> "NodeInput":
-        if isinstance(value, NodeInput):
-            result = NodeInput(data=value.data, metadata=dict(value.metadata), predecessor=value.predecessor)
-            if predecessor is not None:
-                result.predecessor = predecessor
-            return result
-        if isinstance(value, NodeOutput):
-            return cls(data=value.data, metadata=dict(value.metadata), predecessor=predecessor)
-        if isinstance(value, dict) and "data" in value and "metadata" in value:
-            return cls(data=value.get("data"), metadata=dict(value.get("metadata", {})), predecessor=predecessor)
-        metadata: Dict[str, Any] = {}
-        if isinstance(value, dict) and "metadata" in value:
-            metadata = dict(value.get("metadata", {}))
-            payload = value.get("data")
-        else:
-            payload = value
-        return cls(data=payload, metadata=metadata, predecessor=predecessor)
+        builder = _INPUT_BUILDERS.get(type(value))
+        if builder is None:
+            builder = _lookup_builder(_INPUT_BUILDERS, value, _input_from_value)
+        return builder(cls, value, predecessor)
 
     def to_primitive(self) -> Dict[str, Any]:
         return {
@@ -49,8 +37,15 @@ class NodeInput:
             "predecessor": self.predecessor,
         }
 
+    def get_int(self, key: str, default: int = 0) -> int:
+        """Return ``data[key]`` as an integer, converting only when it is not one already."""
 
-@dataclass
+        data = self.data
+        value = data.get(key, default) if data else default
+        return value if type(value) is int else int(value)
+
+
+@dataclass(slots=True)
 class NodeOutput:
     """Result produced by a node execution."""
 
@@ -60,22 +55,96 @@ class NodeOutput:
 
     @classmethod
     def from_value(cls, value: Any) -> "NodeOutput":
-        if isinstance(value, NodeOutput):
-            return NodeOutput(status=value.status, data=value.data, metadata=dict(value.metadata))
-        if isinstance(value, dict):
-            status = str(value.get("status", "success"))
-            data = value.get("data")
-            metadata = dict(value.get("metadata", {}))
-            for key, val in value.items():
-                if key not in {"status", "data", "metadata"}:
-                    metadata.setdefault(key, val)
-            return cls(status=status, data=data, metadata=metadata)
-        return cls(status="success", data=value, metadata={})
+        builder = _OUTPUT_BUILDERS.get(type(value))
+        if builder is None:
+            builder = _lookup_builder(_OUTPUT_BUILDERS, value, _output_from_value)
+        return builder(cls, value)
 
     def to_primitive(self) -> Dict[str, Any]:
         return {"status": self.status, "data": self.data, "metadata": dict(self.metadata)}
 
 
+# ``from_value`` runs on every hop, so the conversion is chosen with one dict
+# lookup on the exact type. Subclasses resolve through isinstance once and are
+# then cached under their own type.
+#
+# Converted objects share the source's metadata dict instead of copying it;
+# ``ExecutableNode.execute`` copies at the points where metadata is modified.
+def _as_metadata(value: Any) -> Dict[str, Any]:
+    return value if type(value) is dict else dict(value)
+
+
+def _input_from_input(cls: type, value: NodeInput, predecessor: Optional[str]) -> NodeInput:
+    return NodeInput(
+        data=value.data,
+        metadata=value.metadata,
+        predecessor=value.predecessor if predecessor is None else predecessor,
+    )
+
+
+def _input_from_output(cls: type, value: NodeOutput, predecessor: Optional[str]) -> NodeInput:
+    return cls(data=value.data, metadata=value.metadata, predecessor=predecessor)
+
+
+def _input_from_dict(cls: type, value: Dict[str, Any], predecessor: Optional[str]) -> NodeInput:
+    if "metadata" in value:
+        return cls(data=value.get("data"), metadata=_as_metadata(value["metadata"]), predecessor=predecessor)
+    return cls(data=value, metadata={}, predecessor=predecessor)
+
+
+def _input_from_value(cls: type, value: Any, predecessor: Optional[str]) -> NodeInput:
+    return cls(data=value, metadata={}, predecessor=predecessor)
+
+
+_OUTPUT_RESERVED_KEYS = frozenset({"status", "data", "metadata"})
+
+
+def _output_from_output(cls: type, value: NodeOutput) -> NodeOutput:
+    return NodeOutput(status=value.status, data=value.data, metadata=value.metadata)
+
+
+def _output_from_dict(cls: type, value: Dict[str, Any]) -> NodeOutput:
+    metadata = value.get("metadata", {})
+    extra = [key for key in value if key not in _OUTPUT_RESERVED_KEYS]
+    if extra:
+        # Unknown top-level keys are folded into a copy of the metadata.
+        metadata = dict(metadata)
+        for key in extra:
+            metadata.setdefault(key, value[key])
+    else:
+        metadata = _as_metadata(metadata)
+    return cls(status=str(value.get("status", "success")), data=value.get("data"), metadata=metadata)
+
+
+def _output_from_value(cls: type, value: Any) -> NodeOutput:
+    return cls(status="success", data=value, metadata={})
+
+
+_INPUT_BUILDERS: Dict[type, Callable[..., NodeInput]] = {
+    NodeInput: _input_from_input,
+    NodeOutput: _input_from_output,
+    dict: _input_from_dict,
+}
+
+_OUTPUT_BUILDERS: Dict[type, Callable[..., NodeOutput]] = {
+    NodeOutput: _output_from_output,
+    dict: _output_from_dict,
+}
+
+
+def _lookup_builder(
+    builders: Dict[type, Callable[..., Any]], value: Any, fallback: Callable[..., Any]
+) -> Callable[..., Any]:
+    for base in (NodeInput, NodeOutput, dict):
+        builder = builders.get(base)
+        if builder is not None and isinstance(value, base):
+            break
+    else:
+        builder = fallback
+    builders[type(value)] = builder
+    return builder
+
+
 class NodeExecutor(Protocol):
     async def run(self, node_input: NodeInput, env: Dict[str, str]) -> NodeOutput:
         ...
@@ -84,24 +153,93 @@ class NodeExecutor(Protocol):
 class InlinePythonExecutor:
     def __init__(self, callable_path: str):
         self._callable_path = callable_path
+        self._func: Optional[Callable[..., Any]] = None
+        self._is_coroutine = False
+
+    def _resolve(self) -> Callable[..., Any]:
+        # Resolved on first use so import errors still surface as node errors.
+        if self._func is None:
+            func = utils.load_callable(self._callable_path)
+            self._is_coroutine = inspect.iscoroutinefunction(func)
+            self._func = func
+        return self._func
 
     async def run(self, node_input: NodeInput, env: Dict[str, str]) -> NodeOutput:
-        func = utils.load_callable(self._callable_path)
+        func = self._resolve()
         with utils.scoped_env(env):
-            result = func(node_input)
-            if inspect.isawaitable(result):
-                result = await result
+            if self._is_coroutine:
+                result = await func(node_input)
+            else:
+                result = func(node_input)
+                if inspect.isawaitable(result):
+                    result = await result
         return NodeOutput.from_value(result)
 
 
-def _execute_in_process(callable_path: str, node_input: Dict[str, Any], env: Dict[str, str]) -> Dict[str, Any]:  # pragma: no cover - executed in child
+class ThreadPythonExecutor(InlinePythonExecutor):
+    """Run a synchronous callable on a worker thread so it does not block the event loop."""
+
+    def __init__(self, callable_path: str, pool: ThreadPoolExecutor):
+        super().__init__(callable_path)
+        self._pool = pool
+
+    def _call(self, func: Callable[..., Any], node_input: NodeInput, env: Dict[str, str]) -> Any:
+        with utils.scoped_env(env):
+            return func(node_input)
+
+    async def run(self, node_input: NodeInput, env: Dict[str, str]) -> NodeOutput:
+        func = self._resolve()
+        if self._is_coroutine:
+            # Coroutines already cooperate with the loop; a thread buys nothing.
+            return await super().run(node_input, env)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._pool, self._call, func, node_input, env)
+        if inspect.isawaitable(result):
+            result = await result
+        return NodeOutput.from_value(result)
+
+
+# Byte payloads at least this large reach process workers through shared memory
+# rather than being pickled through the pool's pipe.
+_SHARED_MEMORY_THRESHOLD = 1 << 20
+
+
+class _SharedBytes(NamedTuple):
+    """Reference to payload bytes placed in a shared memory block by the parent."""
+
+    name: str
+    size: int
+    mutable: bool
+
+    @classmethod
+    def publish(cls, data: bytes | bytearray) -> tuple["_SharedBytes", shared_memory.SharedMemory]:
+        block = shared_memory.SharedMemory(create=True, size=len(data))
+        block.buf[: len(data)] = data
+        return cls(block.name, len(data), type(data) is bytearray), block
+
+    def load(self) -> bytes | bytearray:  # pragma: no cover - executed in child
+        block = shared_memory.SharedMemory(name=self.name)
+        try:
+            view = block.buf[: self.size]
+            try:
+                return bytearray(view) if self.mutable else bytes(view)
+            finally:
+                view.release()
+        finally:
+            block.close()
+
+
+def _execute_in_process(callable_path: str, node_input: Dict[str, Any], env: Dict[str, str]) -> NodeOutput:  # pragma: no cover - executed in child
+    if type(node_input.get("data")) is _SharedBytes:
+        node_input["data"] = node_input["data"].load()
     node_input_obj = NodeInput.from_value(node_input)
     func = utils.load_callable(callable_path)
     with utils.scoped_env(env):
         result = func(node_input_obj)
     if inspect.isawaitable(result):  # pragma: no cover - process pool cannot await
         raise RuntimeError("Functions executed in a process pool cannot be asynchronous.")
-    return NodeOutput.from_value(result).to_primitive()
+    # The dataclass itself is pickled back, so the parent receives a ready NodeOutput.
+    return NodeOutput.from_value(result)
 
 
 class ProcessPythonExecutor:
@@ -112,29 +250,44 @@ class ProcessPythonExecutor:
     async def run(self, node_input: NodeInput, env: Dict[str, str]) -> NodeOutput:
         loop = asyncio.get_running_loop()
         primitive_input = node_input.to_primitive()
-        output = await loop.run_in_executor(self._pool, _execute_in_process, self._callable_path, primitive_input, env)
-        return NodeOutput.from_value(output)
+        data = primitive_input["data"]
+        block: Optional[shared_memory.SharedMemory] = None
+        if type(data) in (bytes, bytearray) and len(data) >= _SHARED_MEMORY_THRESHOLD:
+            primitive_input["data"], block = _SharedBytes.publish(data)
+        try:
+            output = await loop.run_in_executor(
+                self._pool, _execute_in_process, self._callable_path, primitive_input, env
+            )
+        finally:
+            if block is not None:
+                block.close()
+                block.unlink()
+        return output
 
 
 class DockerExecutor:
     def __init__(self, definition: NodeDefinition, global_config: GlobalConfig):
         self._definition = definition
         self._global_config = global_config
+        # Everything except the environment flags is fixed per node, so the
+        # command is assembled once around the point where ``-e`` flags go.
+        # ``-i`` keeps the container's stdin attached so it receives the payload.
+        self._command_prefix: List[str] = ["docker", "run", "--rm", "-i"]
+        self._command_suffix: List[str] = []
+        if definition.workdir:
+            self._command_suffix.extend(["-w", definition.workdir])
+        if definition.image:
+            self._command_suffix.append(global_config.resolve_image(definition.image))
+        self._command_suffix.extend(definition.command or ())
+        self._command_suffix.extend(definition.args or ())
 
     async def run(self, node_input: NodeInput, env: Dict[str, str]) -> NodeOutput:
         if not self._definition.image:
             raise ValueError(f"Node '{self._definition.id}' requires a container image.")
-        image = self._global_config.resolve_image(self._definition.image)
-        command: List[str] = ["docker", "run", "--rm"]
+        command = list(self._command_prefix)
         for key, value in env.items():
-            command.extend(["-e", f"{key}={value}"])
-        if self._definition.workdir:
-            command.extend(["-w", self._definition.workdir])
-        command.append(image)
-        if self._definition.command:
-            command.extend(self._definition.command)
-        if self._definition.args:
-            command.extend(self._definition.args)
+            command += ("-e", f"{key}={value}")
+        command += self._command_suffix
 
         process = await asyncio.create_subprocess_exec(
             *command,
@@ -142,7 +295,11 @@ class DockerExecutor:
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
         )
-        payload = json.dumps(node_input.to_primitive()).encode("utf-8")
+        # The payload is serialised straight from the input; to_primitive()
+        # would only copy the metadata dict before it is encoded.
+        payload = json_utils.dumps_bytes(
+            {"data": node_input.data, "metadata": node_input.metadata, "predecessor": node_input.predecessor}
+        )
         stdout, stderr = await process.communicate(payload)
         if process.returncode != 0:
             return NodeOutput(
@@ -154,16 +311,81 @@ class DockerExecutor:
                 },
                 metadata={"executor": "docker"},
             )
-        if stdout:
-            text = stdout.decode("utf-8", errors="replace").strip()
-            if text:
-                try:
-                    return NodeOutput.from_value(json.loads(text))
-                except json.JSONDecodeError:
-                    return NodeOutput(status="success", data=text, metadata={"raw": True})
+        body = stdout.strip()
+        if body:
+            try:
+                return NodeOutput.from_value(json_utils.loads(body))
+            except ValueError:
+                text = body.decode("utf-8", errors="replace")
+                return NodeOutput(status="success", data=text, metadata={"raw": True})
         return NodeOutput(status="success", data=None, metadata={"executor": "docker"})
 
 
+def _require_callable(definition: NodeDefinition) -> str:
+    if not definition.callable:
+        raise ValueError(f"Node '{definition.id}' requires a callable.")
+    return definition.callable
+
+
+def _build_inline_executor(
+    definition: NodeDefinition,
+    global_config: GlobalConfig,
+    process_pool: Optional[ProcessPoolExecutor],
+    thread_pool: Optional[ThreadPoolExecutor],
+) -> NodeExecutor:
+    return InlinePythonExecutor(_require_callable(definition))
+
+
+def _build_thread_executor(
+    definition: NodeDefinition,
+    global_config: GlobalConfig,
+    process_pool: Optional[ProcessPoolExecutor],
+    thread_pool: Optional[ThreadPoolExecutor],
+) -> NodeExecutor:
+    callable_path = _require_callable(definition)
+    if thread_pool is None:
+        raise RuntimeError("Thread executor requested without an available thread pool.")
+    return ThreadPythonExecutor(callable_path, thread_pool)
+
+
+def _build_process_executor(
+    definition: NodeDefinition,
+    global_config: GlobalConfig,
+    process_pool: Optional[ProcessPoolExecutor],
+    thread_pool: Optional[ThreadPoolExecutor],
+) -> NodeExecutor:
+    callable_path = _require_callable(definition)
+    if process_pool is None:
+        raise RuntimeError("Process executor requested without an available process pool.")
+    return ProcessPythonExecutor(callable_path, process_pool)
+
+
+def _build_docker_executor(
+    definition: NodeDefinition,
+    global_config: GlobalConfig,
+    process_pool: Optional[ProcessPoolExecutor],
+    thread_pool: Optional[ThreadPoolExecutor],
+) -> NodeExecutor:
+    return DockerExecutor(definition, global_config)
+
+
+_EXECUTOR_BUILDERS: Dict[
+    str,
+    Callable[
+        [NodeDefinition, GlobalConfig, Optional[ProcessPoolExecutor], Optional[ThreadPoolExecutor]], NodeExecutor
+    ],
+] = {
+    "inline": _build_inline_executor,
+    "thread": _build_thread_executor,
+    "process": _build_process_executor,
+    "docker": _build_docker_executor,
+}
+
+# Python executors hold no per-node state beyond the callable and pool, so nodes
+# of one flow that share both can also share one executor (and its resolved callable).
+_SHAREABLE_EXECUTORS = frozenset({"inline", "thread", "process"})
+
+
 class ExecutableNode:
     """Runtime wrapper responsible for executing node definitions."""
 
@@ -172,31 +394,58 @@ class ExecutableNode:
         definition: NodeDefinition,
         global_config: GlobalConfig,
         process_pool: Optional[ProcessPoolExecutor] = None,
+        thread_pool: Optional[ThreadPoolExecutor] = None,
+        shared_executors: Optional[Dict[tuple, NodeExecutor]] = None,
     ) -> None:
         self.definition = definition
         self.global_config = global_config
         self.process_pool = process_pool
+        self.thread_pool = thread_pool
         self.logger = get_node_logger(definition.id)
-        self._executor = self._build_executor()
-
-    def _build_executor(self) -> NodeExecutor:
-        if self.definition.executor == "inline":
-            if not self.definition.callable:
-                raise ValueError(f"Node '{self.definition.id}' requires a callable.")
-            return InlinePythonExecutor(self.definition.callable)
-        if self.definition.executor == "process":
-            if not self.definition.callable:
-                raise ValueError(f"Node '{self.definition.id}' requires a callable.")
-            if self.process_pool is None:
-                raise RuntimeError("Process executor requested without an available process pool.")
-            return ProcessPythonExecutor(self.definition.callable, self.process_pool)
-        if self.definition.executor == "docker":
-            return DockerExecutor(self.definition, self.global_config)
-        raise ValueError(f"Unknown executor type '{self.definition.executor}' for node '{self.definition.id}'.")
+        self._executor = self._build_executor(shared_executors)
+        # Both sources are fixed for the lifetime of the node.
+        self._env = utils.merge_env(global_config.env, definition.env)
+        self._cache_key: Optional[tuple] = None
+        self._cache_value: Optional[NodeOutput] = None
+
+    def invalidate(self) -> None:
+        """Drop the memoised output so the next execution runs the node again."""
+        self._cache_key = None
+        self._cache_value = None
+
+    def _build_executor(self, shared_executors: Optional[Dict[tuple, NodeExecutor]] = None) -> NodeExecutor:
+        kind = self.definition.executor
+        builder = _EXECUTOR_BUILDERS.get(kind)
+        if builder is None:
+            raise ValueError(f"Unknown executor type '{kind}' for node '{self.definition.id}'.")
+        if shared_executors is None or kind not in _SHAREABLE_EXECUTORS:
+            return builder(self.definition, self.global_config, self.process_pool, self.thread_pool)
+        # The owner of ``shared_executors`` also owns the pools, so the key
+        # needs only the kind and the callable.
+        key = (kind, self.definition.callable)
+        executor = shared_executors.get(key)
+        if executor is None:
+            executor = builder(self.definition, self.global_config, self.process_pool, self.thread_pool)
+            shared_executors[key] = executor
+        return executor
 
     async def execute(self, value: Any = None, predecessor: Optional[str] = None) -> NodeOutput:
         node_input = NodeInput.from_value(value, predecessor=predecessor)
-        env = utils.merge_env(self.global_config.env, self.definition.env)
+        # The input metadata may be shared with sibling nodes and the trace;
+        # the node gets its own copy so changes it makes stay local.
+        node_input.metadata = dict(node_input.metadata)
+        cache_key: Optional[tuple] = None
+        if self.definition.cache:
+            data_key = utils.payload_key(node_input.data)
+            if data_key is not None:
+                cache_key = (predecessor, data_key)
+                if cache_key == self._cache_key and self._cache_value is not None:
+                    self.logger.info("Node '%s' reused its cached output", self.definition.id)
+                    cached = self._cache_value
+                    return NodeOutput(
+                        status=cached.status, data=cached.data, metadata={**cached.metadata, "cached": True}
+                    )
+        env = self._env
         start_time = time.perf_counter()
         self.logger.info("Starting node '%s'", self.definition.id)
         try:
@@ -233,7 +482,9 @@ class ExecutableNode:
                 metadata={"duration": duration, "node_id": self.definition.id, "predecessor": predecessor},
             )
 
-        output = NodeOutput.from_value(result)
+        # Executors always return a NodeOutput, but its metadata may still be
+        # the dict the callable returned, so the run details go into a new one.
+        output = result
         duration = time.perf_counter() - start_time
         metadata = {
             **output.metadata,
@@ -245,6 +496,9 @@ class ExecutableNode:
         if predecessor is not None:
             metadata["predecessor"] = predecessor
         output.metadata = metadata
+        if cache_key is not None:
+            self._cache_key = cache_key
+            self._cache_value = NodeOutput(status=output.status, data=output.data, metadata=dict(metadata))
         self.logger.info("Node '%s' completed with status %s", self.definition.id, output.status)
         return output
 
@@ -2,17 +2,38 @@
 from __future__ import annotations
 
 import contextlib
-
+import hashlib
+import http.client
+import os
+import re
+import ssl
 import subprocess
+import sys
 import tempfile
+import urllib.error
 import urllib.parse
 import urllib.request
 import uuid
+from email.message import Message
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
+from . import json_utils
 from .config import GlobalConfig, RepositoryLocation
 
+_COMMIT_PATTERN = re.compile(r"[0-9a-fA-F]{7,40}")
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+_MAX_REDIRECTS = 10
+_USER_AGENT = f"Python-urllib/{sys.version_info[0]}.{sys.version_info[1]}"
+
+# urllib keeps only a small shared parse cache; identifiers repeat across a run.
+_parse_identifier = lru_cache(maxsize=1024)(urllib.parse.urlparse)
+
+# HTTP downloads are cached in a dot-directory of the cache root. Git clones
+# live next to it under their location name, which must not take this one.
+_HTTP_CACHE_DIR = ".http-cache"
+
 
 class ResourceResolver:
     """Resolve files and code locations declared in :class:`GlobalConfig`."""
@@ -21,20 +42,45 @@ class ResourceResolver:
         self._config = config
         self._stack = contextlib.ExitStack()
         self._temp_dir: Optional[Path] = None
+        # Paths returned by resolve_file while this resolver is entered.
+        self._resolved: Dict[str, Path] = {}
+        # Downloads already made by this resolver, keyed like the HTTP cache.
+        self._downloads: Dict[str, Path] = {}
+        # Git checkouts already prepared by this resolver, keyed by location name.
+        self._checkouts: Dict[str, Path] = {}
+        # Verified filesystem repository roots and the last code_paths() result.
+        self._roots: Dict[str, Path] = {}
+        self._code_paths: Optional[Dict[str, Path]] = None
+        # Kept-alive HTTP connections keyed by (scheme, netloc); closed on exit.
+        self._connections: Dict[Tuple[str, str], http.client.HTTPConnection] = {}
+        self._proxies = urllib.request.getproxies()
+        # Cache directories this resolver created; cleared on exit so a later
+        # session recreates any that were removed in the meantime.
+        self._ensured_dirs: set[Path] = set()
         self._cache_root = Path(
             cache_root
             or config.extra.get("resource_cache_dir")
             or (Path.home() / ".conductor" / "sources")
         ).expanduser()
-        self._cache_root.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self._cache_root)
 
     def __enter__(self) -> "ResourceResolver":
         self._stack.__enter__()
         temp_dir = self._stack.enter_context(tempfile.TemporaryDirectory(prefix="conductor_res_"))
         self._temp_dir = Path(temp_dir)
+        self._stack.callback(self._close_connections)
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
+        # Every memo is scoped to one ``with`` block: uncached downloads live
+        # in the temporary directory removed below, and a later session should
+        # revalidate cached URLs and fetch branch checkouts again.
+        self._resolved.clear()
+        self._downloads.clear()
+        self._checkouts.clear()
+        self._ensured_dirs.clear()
+        self._roots.clear()
+        self._code_paths = None
         self._stack.__exit__(exc_type, exc, tb)
 
     # ------------------------------------------------------------------
@@ -47,7 +93,41 @@ class ResourceResolver:
         if identifier is None:
             return None
         identifier = str(identifier)
-        parsed = urllib.parse.urlparse(identifier)
+        path = self._resolved.get(identifier)
+        if path is None:
+            path = self._resolved[identifier] = self._resolve_identifier(identifier)
+        return path
+
+    def code_paths(self) -> Dict[str, Path]:
+        """Return filesystem paths for configured code locations keyed by their alias."""
+
+        if self._code_paths is not None:
+            return dict(self._code_paths)
+        paths: Dict[str, Path] = {}
+        for name, location in self._config.code_locations.items():
+            root = self._repository_root(location)
+            if isinstance(root, str):
+                raise ValueError(
+                    f"Code location '{name}' uses type '{location.kind}' which does not resolve to a filesystem path."
+                )
+            path = root
+            if location.subpath:
+                subpath = self._normalise_relative(location.subpath)
+                path = (root / subpath).resolve()
+            if not path.exists():
+                raise FileNotFoundError(
+                    f"Code location '{name}' resolved to '{path}', but that path does not exist."
+                )
+            paths[name] = path
+        self._code_paths = paths
+        return dict(paths)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _resolve_identifier(self, identifier: str) -> Path:
+        parsed = _parse_identifier(identifier)
         scheme = parsed.scheme.lower()
 
         if not scheme:
@@ -76,31 +156,6 @@ class ResourceResolver:
             f"Unsupported resource identifier '{identifier}'. Provide a local path, URL, or registered alias."
         )
 
-    def code_paths(self) -> Dict[str, Path]:
-        """Return filesystem paths for configured code locations keyed by their alias."""
-
-        paths: Dict[str, Path] = {}
-        for name, location in self._config.code_locations.items():
-            root = self._repository_root(location)
-            if isinstance(root, str):
-                raise ValueError(
-                    f"Code location '{name}' uses type '{location.kind}' which does not resolve to a filesystem path."
-                )
-            path = root
-            if location.subpath:
-                subpath = self._normalise_relative(location.subpath)
-                path = (root / subpath).resolve()
-            if not path.exists():
-                raise FileNotFoundError(
-                    f"Code location '{name}' resolved to '{path}', but that path does not exist."
-                )
-            paths[name] = path
-        return paths
-
-    # ------------------------------------------------------------------
-    # Internal helpers
-    # ------------------------------------------------------------------
-
     def _resolve_from_location(self, location: RepositoryLocation, parsed: urllib.parse.ParseResult) -> Path:
         relative = self._relative_from_parsed(parsed)
         if location.kind in {"filesystem", "git"}:
@@ -127,12 +182,16 @@ class ResourceResolver:
 
     def _repository_root(self, location: RepositoryLocation) -> Path | str:
         if location.kind == "filesystem":
+            root = self._roots.get(location.name)
+            if root is not None:
+                return root
             root = Path(location.location).expanduser()
             if not root.exists():
                 raise FileNotFoundError(
                     f"Filesystem repository '{location.name}' expected at '{root}' does not exist."
                 )
-            return root.resolve()
+            root = self._roots[location.name] = root.resolve()
+            return root
         if location.kind == "git":
             return self._ensure_git_checkout(location)
         if location.kind == "http":
@@ -140,24 +199,73 @@ class ResourceResolver:
             return url
         raise ValueError(f"Unknown repository type '{location.kind}'.")
 
+    def _ensure_dir(self, path: Path) -> None:
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
+
     def _ensure_git_checkout(self, location: RepositoryLocation) -> Path:
+        checkout = self._checkouts.get(location.name)
+        if checkout is not None:
+            return checkout
+        if location.name == _HTTP_CACHE_DIR:
+            raise ValueError(f"Git repository location name '{_HTTP_CACHE_DIR}' is reserved for the HTTP cache.")
         repo_dir = (self._cache_root / location.name).expanduser()
-        repo_dir.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(repo_dir.parent)
+        ref = location.reference
+        pinned = False
         if not repo_dir.exists():
-            self._run_git(["clone", location.location, str(repo_dir)])
+            self._clone(location, repo_dir)
+        elif ref and self._is_pinned(repo_dir, ref):
+            # Commits and annotated tags cannot move, so there is nothing to fetch.
+            pinned = True
         else:
             self._run_git(["-C", str(repo_dir), "fetch", "--all", "--tags", "--prune"])
-        if location.reference:
-            ref = location.reference
-            self._run_git(["-C", str(repo_dir), "checkout", ref])
+        if ref:
+            self._checkout(repo_dir, ref)
+            if not pinned:
+                try:
+                    self._run_git(["-C", str(repo_dir), "pull", "--ff-only"])
+                except RuntimeError:
+                    # Likely on a tag or detached commit; ignore pull failures.
+                    pass
+        checkout = self._checkouts[location.name] = repo_dir.resolve()
+        return checkout
+
+    def _clone(self, location: RepositoryLocation, repo_dir: Path) -> None:
+        ref = location.reference
+        if ref and not _COMMIT_PATTERN.fullmatch(ref):
+            # Branches and tags can be cloned without their history.
             try:
-                self._run_git(["-C", str(repo_dir), "pull", "--ff-only"])
+                self._run_git(
+                    ["clone", "--depth=1", "--no-single-branch", "--branch", ref, location.location, str(repo_dir)]
+                )
+                return
             except RuntimeError:
-                # Likely on a tag or detached commit; ignore pull failures.
                 pass
-        return repo_dir.resolve()
+        self._run_git(["clone", location.location, str(repo_dir)])
+
+    def _checkout(self, repo_dir: Path, ref: str) -> None:
+        try:
+            self._run_git(["-C", str(repo_dir), "checkout", ref])
+        except RuntimeError:
+            # A shallow clone may lack the requested ref; fetch the full history once.
+            if not (repo_dir / ".git" / "shallow").exists():
+                raise
+            self._run_git(["-C", str(repo_dir), "fetch", "--unshallow", "--tags"])
+            self._run_git(["-C", str(repo_dir), "checkout", ref])
 
-    def _run_git(self, args: list[str]) -> None:
+    def _is_pinned(self, repo_dir: Path, ref: str) -> bool:
+        try:
+            if _COMMIT_PATTERN.fullmatch(ref):
+                commit = self._run_git(["-C", str(repo_dir), "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"])
+                return commit.strip().lower().startswith(ref.lower())
+            kind = self._run_git(["-C", str(repo_dir), "cat-file", "-t", f"refs/tags/{ref}"])
+            return kind.strip() == "tag"
+        except RuntimeError:
+            return False
+
+    def _run_git(self, args: list[str]) -> str:
         command = ["git", *args]
         result = subprocess.run(
             command,
@@ -170,6 +278,7 @@ class ResourceResolver:
             raise RuntimeError(
                 f"Git command '{' '.join(command)}' failed with exit code {result.returncode}: {result.stderr.strip()}"
             )
+        return result.stdout
 
     def _relative_from_parsed(self, parsed: urllib.parse.ParseResult) -> Path:
         segments = []
@@ -205,17 +314,122 @@ class ResourceResolver:
     ) -> Path:
         if self._temp_dir is None:
             raise RuntimeError("ResourceResolver must be entered before downloading files.")
-        request = urllib.request.Request(url)
-        for key, value in (headers or {}).items():
-            request.add_header(key, value)
-        with contextlib.closing(urllib.request.urlopen(request)) as response:
-            data = response.read()
+        headers = headers or {}
+        cache_key = hashlib.blake2b(repr((url, sorted(headers.items()))).encode("utf-8"), digest_size=16).hexdigest()
+        known = self._downloads.get(cache_key)
+        if known is not None:
+            return known
+
         name = suggested_name or Path(urllib.parse.urlparse(url).path).name or "resource"
         safe_name = name.replace("/", "_")
-        target = self._temp_dir / f"{uuid.uuid4().hex}_{safe_name}"
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_bytes(data)
+        # Responses carrying an ETag or Last-Modified header are kept under the
+        # cache root and revalidated with a conditional request next time.
+        cache_dir = self._cache_root / _HTTP_CACHE_DIR
+        cached = cache_dir / f"{cache_key}_{safe_name}"
+        validators_path = cache_dir / f"{cache_key}.json"
+        validators: Dict[str, str] = {}
+        if cached.exists() and validators_path.exists():
+            try:
+                validators = dict(json_utils.loads(validators_path.read_bytes()))
+            except (OSError, ValueError, TypeError):
+                validators = {}
+
+        request_headers = dict(headers)
+        if validators.get("etag"):
+            request_headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            request_headers["If-Modified-Since"] = validators["last_modified"]
+        status, response_headers, data = self._fetch(url, request_headers)
+        if status == 304 and validators:
+            self._downloads[cache_key] = cached
+            return cached
+        if status >= 300:
+            raise urllib.error.HTTPError(url, status, http.client.responses.get(status, ""), response_headers, None)
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+
+        if etag or last_modified:
+            self._ensure_dir(cache_dir)
+            _write_atomic(cached, data)
+            _write_atomic(validators_path, json_utils.dumps_bytes({"etag": etag, "last_modified": last_modified}))
+            target = cached
+        else:
+            target = self._temp_dir / f"{uuid.uuid4().hex}_{safe_name}"
+            target.write_bytes(data)
+        self._downloads[cache_key] = target
         return target
 
+    def _fetch(self, url: str, headers: Dict[str, str]) -> Tuple[int, Message, bytes]:
+        """GET ``url`` and return its status, headers and body.
+
+        Plain HTTP(S) requests reuse one kept-alive connection per host for the
+        lifetime of the resolver, so fetching many files from one location pays
+        for a single TLS handshake. Proxied and non-HTTP URLs go through urllib.
+        """
+        if not any(key.lower() == "user-agent" for key in headers):
+            headers = {**headers, "User-Agent": _USER_AGENT}
+        for _ in range(_MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            scheme = parts.scheme.lower()
+            if scheme not in {"http", "https"} or scheme in self._proxies:
+                return self._fetch_with_urllib(url, headers)
+            key = (scheme, parts.netloc)
+            path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+            for attempt in range(2):
+                connection = self._connections.get(key)
+                reused = connection is not None
+                if connection is None:
+                    connection = self._connections[key] = self._connect(scheme, parts)
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                    break
+                except (http.client.HTTPException, OSError):
+                    connection.close()
+                    del self._connections[key]
+                    # The server may have dropped an idle kept-alive connection.
+                    if reused and attempt == 0:
+                        continue
+                    raise
+            if response.will_close:
+                connection.close()
+                del self._connections[key]
+            location = response.getheader("Location")
+            if response.status in _REDIRECT_STATUSES and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            return response.status, response.headers, body
+        raise urllib.error.HTTPError(url, 310, "Too many redirects", Message(), None)
+
+    def _fetch_with_urllib(self, url: str, headers: Dict[str, str]) -> Tuple[int, Message, bytes]:
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with contextlib.closing(urllib.request.urlopen(request)) as response:
+                return response.status or 200, response.headers, response.read()
+        except urllib.error.HTTPError as exc:
+            if exc.code != 304:
+                raise
+            exc.close()
+            return exc.code, exc.headers, b""
+
+    def _connect(self, scheme: str, parts: urllib.parse.SplitResult) -> http.client.HTTPConnection:
+        host = parts.hostname or ""
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, parts.port, context=ssl.create_default_context())
+        return http.client.HTTPConnection(host, parts.port)
+
+    def _close_connections(self) -> None:
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Concurrent resolvers may share the cache; readers only ever see whole files.
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
 
 __all__ = ["ResourceResolver"]
@@ -2,24 +2,50 @@
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import importlib
 import os
-from functools import lru_cache
-from typing import Any, Callable, Dict, Iterator, Mapping
+import pickle
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+_CALLABLES: Dict[str, Callable[..., Any]] = {}
+
+# Overlays entered by ``scoped_env`` may overlap (thread nodes, or async nodes
+# awaiting inside one), so they are tracked per variable: each active overlay
+# holds an entry, the newest entry's value is the one in ``os.environ``, and the
+# value from before the first overlay returns when the last one exits.
+_ENV_LOCK = threading.Lock()
+_ENV_ACTIVE: Dict[str, List[List[str]]] = {}
+_ENV_BASE: Dict[str, Optional[str]] = {}
 
 
-@lru_cache(maxsize=None)
 def load_callable(path: str) -> Callable[..., Any]:
     """Load a callable from the dotted path ``module:attribute``."""
 
+    func = _CALLABLES.get(path)
+    if func is not None:
+        return func
     if ":" not in path:
         raise ValueError(f"Callable path '{path}' must include a ':' separating module and attribute")
     module_name, attribute_name = path.split(":", 1)
     module = importlib.import_module(module_name)
     try:
-        return getattr(module, attribute_name)
+        func = getattr(module, attribute_name)
     except AttributeError as exc:  # pragma: no cover - depends on user input
         raise AttributeError(f"Module '{module_name}' has no attribute '{attribute_name}'.") from exc
+    _CALLABLES[path] = func
+    return func
+
+
+def preload_callables(paths: Iterable[str]) -> None:
+    """Import ``paths`` ahead of use, leaving failures to surface on first call."""
+
+    for path in paths:
+        try:
+            load_callable(path)
+        except Exception:  # pragma: no cover - depends on user code
+            pass
 
 
 def merge_env(*mappings: Mapping[str, str]) -> Dict[str, str]:
@@ -27,7 +53,11 @@ def merge_env(*mappings: Mapping[str, str]) -> Dict[str, str]:
 
     merged: Dict[str, str] = {}
     for mapping in mappings:
-        merged.update({str(key): str(value) for key, value in mapping.items()})
+        for key, value in mapping.items():
+            if type(key) is str and type(value) is str:
+                merged[key] = value
+            else:
+                merged[str(key)] = str(value)
     return merged
 
 
@@ -35,21 +65,69 @@ def merge_env(*mappings: Mapping[str, str]) -> Dict[str, str]:
 def scoped_env(env: Mapping[str, str]) -> Iterator[None]:
     """Temporarily update ``os.environ`` within a context."""
 
-    original: Dict[str, str] = {}
+    if not env:
+        # Most nodes declare no environment; skip the bookkeeping entirely.
+        yield
+        return
+    environ = os.environ
+    entries: List[Tuple[str, List[str]]] = []
     try:
-        for key, value in env.items():
-            key = str(key)
-            if key in os.environ:
-                original[key] = os.environ[key]
-            os.environ[key] = str(value)
+        with _ENV_LOCK:
+            for key, value in env.items():
+                key = key if type(key) is str else str(key)
+                # A fresh list per overlay, so it can be found again by identity.
+                entry = [value if type(value) is str else str(value)]
+                stack = _ENV_ACTIVE.get(key)
+                previous = environ.get(key) if stack is None else None
+                # Written before the bookkeeping: a value ``os.environ`` rejects
+                # (a NUL byte, ``=`` in the key) leaves nothing to undo for it,
+                # and the entries applied so far are unwound below.
+                environ[key] = entry[0]
+                if stack is None:
+                    stack = _ENV_ACTIVE[key] = []
+                    _ENV_BASE[key] = previous
+                stack.append(entry)
+                entries.append((key, entry))
         yield
     finally:
-        for key in env:
-            key = str(key)
-            if key in original:
-                os.environ[key] = original[key]
-            elif key in os.environ:
-                del os.environ[key]
+        with _ENV_LOCK:
+            for key, entry in reversed(entries):
+                stack = _ENV_ACTIVE[key]
+                for index in range(len(stack) - 1, -1, -1):
+                    if stack[index] is entry:
+                        del stack[index]
+                        break
+                if stack:
+                    environ[key] = stack[-1][0]
+                    continue
+                del _ENV_ACTIVE[key]
+                # ``None`` marks variables that were unset before the first overlay.
+                previous = _ENV_BASE.pop(key)
+                if previous is None:
+                    environ.pop(key, None)
+                else:
+                    environ[key] = previous
+
+
+_DIRECT_KEY_TYPES = frozenset({str, int, bool, bytes, type(None)})
+
+
+def payload_key(value: Any) -> Optional[Hashable]:
+    """Return a comparable key for ``value`` or ``None`` when it cannot be derived.
+
+    Strings, integers, booleans, bytes and ``None`` are used directly (paired
+    with their type so that ``1`` and ``True`` stay distinct). Everything else
+    is pickled and digested: equality of floats and containers does not imply
+    equal payloads (``0.0 == -0.0``, ``(1,) == (True,)``), but their pickles differ.
+    """
+
+    if type(value) in _DIRECT_KEY_TYPES:
+        return (type(value), value)
+    try:
+        serialised = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+    return hashlib.blake2b(serialised, digest_size=16).digest()
 
 
 def ensure_dict(mapping: Mapping[str, Any] | None) -> Dict[str, Any]:
@@ -5,16 +5,49 @@ from __future__ import annotations
 import json
 import sys
 import time
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+try:  # pragma: no cover - optional import
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional import
+    import numpy  # type: ignore
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None  # type: ignore[assignment]
 
 
 def _load_input() -> Dict[str, Any]:
-    raw = sys.stdin.read().strip()
+    raw = sys.stdin.buffer.read().strip()
     if not raw:
         return {"data": {}, "metadata": {}}
+    if orjson is not None:
+        return orjson.loads(raw)
     return json.loads(raw)
 
 
+def _is_number_list(values: Any) -> bool:
+    return (
+        isinstance(values, list)
+        and bool(values)
+        and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values)
+    )
+
+
+def _scaled(values: List[float], factor: float) -> List[float]:
+    if numpy is not None:
+        return (numpy.asarray(values) * factor).tolist()
+    return [value * factor for value in values]
+
+
+def _squared(values: List[float]) -> List[float]:
+    if numpy is not None:
+        array = numpy.asarray(values)
+        return (array * array).tolist()
+    return [value * value for value in values]
+
+
 def _build_output(payload: Dict[str, Any]) -> Dict[str, Any]:
     data = dict(payload.get("data") or {})
     metadata = dict(payload.get("metadata") or {})
@@ -24,6 +57,13 @@ def _build_output(payload: Dict[str, Any]) -> Dict[str, Any]:
         data["docker_total"] = total * 2
     if isinstance(number, (int, float)):
         data["docker_number_squared"] = number * number
+    # Batches arrive as ``numbers``/``totals`` lists and are handled in one pass.
+    numbers = data.get("numbers")
+    totals = data.get("totals")
+    if _is_number_list(totals):
+        data["docker_totals"] = _scaled(totals, 2)
+    if _is_number_list(numbers):
+        data["docker_numbers_squared"] = _squared(numbers)
     data["docker_processed"] = True
     metadata.update(
         {
@@ -41,8 +81,11 @@ def _build_output(payload: Dict[str, Any]) -> Dict[str, Any]:
 def main() -> None:
     payload = _load_input()
     result = _build_output(payload)
-    json.dump(result, sys.stdout)
-    sys.stdout.write("\n")
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(result) + b"\n")
+    else:
+        json.dump(result, sys.stdout)
+        sys.stdout.write("\n")
 
 
 if __name__ == "__main__":
@@ -2,49 +2,66 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from conductor.global_state import get_global_state
+from conductor.global_state import GlobalState, get_global_state
 from conductor.node import NodeInput, NodeOutput
 
+# ``get_global_state`` keeps returning the same object once it exists (promotion
+# to shared storage swaps its backing mapping in place), so it is bound once.
+_STATE: Optional[GlobalState] = None
+
+
+def _get_state() -> GlobalState:
+    global _STATE
+    state = _STATE
+    if state is None:
+        state = _STATE = get_global_state()
+    return state
+
 
 async def starter(node_input: NodeInput) -> NodeOutput:
     """Initial node that stores the inbound payload in the global state."""
 
-    state = get_global_state()
-    payload = dict(node_input.data or {})
-    state.set_sync("last_payload", payload)
-    counter = state.get_sync("start_invocations", 0) + 1
-    state.set_sync("start_invocations", counter)
-    await asyncio.sleep(0.05)
-    payload["invocations"] = counter
-    return NodeOutput(data=payload)
+    state = _get_state()
+    data: Dict[str, Any] = node_input.data or {}
+    with state.pipeline() as pipeline:
+        pipeline.set("last_payload", data)
+        pipeline.incr("start_invocations")
+    counter = pipeline.results[1]
+    # Set ``demo_delay`` (seconds) in the input metadata to watch the node yield.
+    delay = node_input.metadata.get("demo_delay")
+    if delay:
+        await asyncio.sleep(float(delay))
+    return NodeOutput(data={**data, "invocations": counter})
+
+
+_PARITY = ("even", "odd")
 
 
 def branching(node_input: NodeInput) -> NodeOutput:
     """Decide which branch to execute based on a numeric value."""
 
-    payload: Dict[str, Any] = dict(node_input.data or {})
-    value = int(payload.get("number", 0))
-    status = "even" if value % 2 == 0 else "odd"
-    payload["parity"] = status
-    return NodeOutput(status=status, data=payload)
+    data: Dict[str, Any] = node_input.data or {}
+    value = node_input.get_int("number")
+    status = _PARITY[value & 1]
+    return NodeOutput(status=status, data={**data, "parity": status})
 
 
 def intensive(node_input: NodeInput) -> NodeOutput:
-    """Simple CPU intensive task executed in a separate process."""
+    """Stand-in for CPU-bound work, run by the process executor in ``flow.json``."""
 
-    payload: Dict[str, Any] = dict(node_input.data or {})
-    number = int(payload.get("number", 0))
-    total = sum(range(number + 1))
-    payload["total"] = total
-    return NodeOutput(data=payload)
+    data: Dict[str, Any] = node_input.data or {}
+    number = node_input.get_int("number")
+    # Closed form of sum(range(number + 1)), which is 0 for negative numbers.
+    total = number * (number + 1) // 2 if number >= 0 else 0
+    return NodeOutput(data={**data, "total": total})
 
 
 def finalizer(node_input: NodeInput) -> NodeOutput:
     """Return the aggregated information and the final shared state."""
 
-    state = get_global_state()
+    state = _get_state()
     snapshot = state.to_dict()
     result = {
         "input": node_input.data,